@@ -16,27 +16,34 @@ class CacheManager:
         )
         os.makedirs(self.cache_dir, exist_ok=True)
 
-    def _get_cache_key(self, url: str, path: str, user_id: str) -> str:
-        """根据URL、路径和用户ID生成唯一缓存键"""
-        content = f"{url}:{path}:{user_id}"
-        return hashlib.md5(content.encode("utf-8")).hexdigest()
+    def _get_scope_prefix(self, url: str) -> str:
+        """根据身份范围生成缓存键前缀，便于按范围清理"""
+        return hashlib.md5(str(url).encode("utf-8")).hexdigest()[:8]
+
+    def _get_cache_key(self, url: str, path: str) -> str:
+        """根据身份范围和路径生成唯一缓存键（范围前缀 + 范围与路径的哈希），仅以相同身份访问同一服务器的用户共享缓存"""
+        content = f"{url}:{path}"
+        return f"{self._get_scope_prefix(url)}_{hashlib.md5(content.encode('utf-8')).hexdigest()}"
 
     def _get_cache_file(self, cache_key: str) -> str:
         """根据缓存键生成缓存文件路径"""
         return os.path.join(self.cache_dir, f"{cache_key}.json")
 
     def get_cache(
-        self, url: str, path: str, user_id: str, max_age: int = 300
+        self, url: str, path: str, max_age: int = 300
     ) -> Optional[Dict]:
         """从本地获取缓存数据，并检查是否过期"""
         try:
-            cache_key = self._get_cache_key(url, path, user_id)
+            cache_key = self._get_cache_key(url, path)
             cache_file = self._get_cache_file(cache_key)
 
-            if not os.path.exists(cache_file):
+            # 直接取修改时间，文件不存在时即未命中，省去单独的存在性检查
+            try:
+                mtime = os.path.getmtime(cache_file)
+            except FileNotFoundError:
                 return None
 
-            if time.time() - os.path.getmtime(cache_file) > max_age:
+            if time.time() - mtime > max_age:
                 try:
                     os.remove(cache_file)
                 except:
@@ -50,10 +57,10 @@ class CacheManager:
             logger.debug(f"读取缓存失败: {e}")
             return None
 
-    def set_cache(self, url: str, path: str, user_id: str, data: Dict):
+    def set_cache(self, url: str, path: str, data: Dict):
         """将数据保存到本地缓存"""
         try:
-            cache_key = self._get_cache_key(url, path, user_id)
+            cache_key = self._get_cache_key(url, path)
             cache_file = self._get_cache_file(cache_key)
 
             cache_data = {"timestamp": time.time(), "data": data}
@@ -63,27 +70,25 @@ class CacheManager:
         except Exception as e:
             logger.debug(f"写入缓存失败: {e}")
 
-    def clear_cache(self, user_id: str = None):
+    def delete_cache(self, url: str, path: str):
+        """删除指定路径的缓存"""
+        try:
+            os.remove(self._get_cache_file(self._get_cache_key(url, path)))
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.debug(f"删除缓存失败: {e}")
+
+    def clear_cache(self, url: str = None):
         """清理缓存"""
         try:
-            if user_id:
-                # 清理指定用户的缓存
-                for filename in os.listdir(self.cache_dir):
-                    if filename.endswith(".json"):
-                        cache_key = filename[:-5]
-                        # 简单检查缓存键是否包含用户ID（通过MD5不完美但够用）
-                        test_key = self._get_cache_key("test", "test", user_id)
-                        if user_id in test_key or cache_key.startswith(test_key[:8]):
-                            try:
-                                os.remove(os.path.join(self.cache_dir, filename))
-                            except:
-                                pass
-            else:
-                # 清理所有缓存
-                for filename in os.listdir(self.cache_dir):
-                    if filename.endswith(".json"):
+            # 指定身份范围时只清理该范围的缓存（缓存键以范围前缀开头），否则清理所有缓存
+            prefix = f"{self._get_scope_prefix(url)}_" if url else ""
+            with os.scandir(self.cache_dir) as entries:
+                for entry in entries:
+                    if entry.name.endswith(".json") and entry.name.startswith(prefix):
                         try:
-                            os.remove(os.path.join(self.cache_dir, filename))
+                            os.remove(entry.path)
                         except:
                             pass
         except Exception as e:
@@ -1,14 +1,45 @@
+import asyncio
 import os
 import aiohttp
-from typing import List, Dict, Optional
+from typing import AsyncIterable, List, Dict, Optional
 from urllib.parse import quote
 from astrbot.api import logger
 
+# 上传本地文件时每次读取的块大小
+_UPLOAD_CHUNK_SIZE = 256 * 1024
+
+
+async def _iter_file(file_path: str):
+    """按块读取本地文件（磁盘操作在线程中执行，不阻塞事件循环）"""
+    f = await asyncio.to_thread(open, file_path, "rb")
+    try:
+        while True:
+            chunk = await asyncio.to_thread(f.read, _UPLOAD_CHUNK_SIZE)
+            if not chunk:
+                break
+            yield chunk
+    finally:
+        await asyncio.to_thread(f.close)
+
+
+async def _exact_stream(stream: AsyncIterable[bytes], size: int):
+    """原样转发字节流并统计长度，与声明的大小不符时抛出异常，使上传失败而不是截断或挂起"""
+    sent = 0
+    async for chunk in stream:
+        sent += len(chunk)
+        if sent > size:
+            raise ValueError(f"数据长度超过声明的 {size} 字节")
+        yield chunk
+    if sent != size:
+        raise ValueError(f"数据长度 {sent} 与声明的 {size} 字节不符")
+
+
 class OpenlistClient:
     """Openlist API 客户端"""
 
     def __init__(
-        self, base_url: str, public_base_url: str = "", username: str = "", password: str = "", token: str = "",fixed_base_directory: str = ""
+        self, base_url: str, public_base_url: str = "", username: str = "", password: str = "", token: str = "",fixed_base_directory: str = "",
+        connector: Optional[aiohttp.BaseConnector] = None,
     ):
         self.base_url = base_url.rstrip("/")
         self.public_base_url = public_base_url.rstrip("/") if public_base_url else ""
@@ -16,16 +47,29 @@ class OpenlistClient:
         self.password = password
         self.token = token
         self.fixed_base_directory = fixed_base_directory
+        self.connector = connector
         self.session = None
 
     async def __aenter__(self):
-        self.session = aiohttp.ClientSession()
-        if not self.token and self.username and self.password:
-            await self.login()
+        await self.open()
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        if self.session:
+        await self.close()
+
+    async def open(self):
+        """创建会话并在需要时登录，可脱离上下文管理器长期复用"""
+        # 传入共享连接池时由调用方负责关闭连接池，会话关闭时不释放连接
+        if self.connector is not None:
+            self.session = aiohttp.ClientSession(connector=self.connector, connector_owner=False)
+        else:
+            self.session = aiohttp.ClientSession()
+        if not self.token and self.username and self.password:
+            await self.login()
+
+    async def close(self):
+        """关闭会话"""
+        if self.session and not self.session.closed:
             await self.session.close()
 
     async def login(self) -> bool:
@@ -53,9 +97,9 @@ class OpenlistClient:
             return False
 
     async def list_files(
-        self, path: str = "/", page: int = 1, per_page: int = 30
+        self, path: str = "/", page: int = 1, per_page: int = 30, quiet: bool = False
     ) -> Optional[Dict]:
-        """获取文件列表"""
+        """获取文件列表；quiet 为真时服务器拒绝列出（如路径是文件）仅记录调试日志"""
         try:
             headers = {}
             if self.token:
@@ -77,7 +121,8 @@ class OpenlistClient:
                     if result.get("code") == 200:
                         return result.get("data")
                     else:
-                        logger.error(f"获取文件列表失败 - code: {result.get('code')}, message: {result.get('message', '未知错误')}, 路径: {path}")
+                        log = logger.debug if quiet else logger.error
+                        log(f"获取文件列表失败 - code: {result.get('code')}, message: {result.get('message', '未知错误')}, 路径: {path}")
                         return None
                 else:
                     error_text = await resp.text()
@@ -151,7 +196,10 @@ class OpenlistClient:
     async def get_download_url(self, path: str) -> Optional[str]:
         """获取文件下载链接"""
         file_info = await self.get_file_info(path)
+        return self.build_download_url(path, file_info)
 
+    def build_download_url(self, path: str, file_info: Optional[Dict]) -> Optional[str]:
+        """根据已获取的文件信息拼接下载链接，无需再次请求"""
         if file_info and not file_info.get("is_dir", True):
             sign = file_info.get("sign")
             base_url_to_use = self.public_base_url if self.public_base_url else self.base_url
@@ -176,46 +224,61 @@ class OpenlistClient:
     async def upload_file(
         self, file_path: str, target_path: str, filename: str = None
     ) -> bool:
-        """上传文件到Openlist"""
+        """上传文件到Openlist（按块读取，不将整个文件载入内存）"""
         try:
-            if not os.path.exists(file_path):
+            try:
+                size = await asyncio.to_thread(os.path.getsize, file_path)
+            except FileNotFoundError:
                 logger.error(f"文件不存在: {file_path}")
                 return False
 
             if filename is None:
                 filename = os.path.basename(file_path)
 
-            upload_url = f"{self.base_url}/api/fs/put"
-
-            with open(file_path, "rb") as f:
-                file_data = f.read()
+            return await self._put(_exact_stream(_iter_file(file_path), size), target_path, filename, {"Content-Length": str(size)})
 
-            headers = {
-                "Content-Type": "application/octet-stream",
-                "File-Path": quote(f"{target_path.rstrip('/')}/{filename}", safe="/"),
-            }
+        except Exception as e:
+            logger.error(f"上传文件失败: {e}, 文件路径: {file_path}, 目标路径: {target_path}/{filename}", exc_info=True)
+            return False
 
-            if hasattr(self, "token") and self.token:
-                headers["Authorization"] = self.token
+    async def upload_stream(
+        self, stream: AsyncIterable[bytes], size: int, target_path: str, filename: str
+    ) -> bool:
+        """将异步字节流直接上传到Openlist，无需先落盘（服务器要求预先给出文件大小，实际长度不符时上传失败）"""
+        try:
+            return await self._put(_exact_stream(stream, size), target_path, filename, {"Content-Length": str(size)})
+        except Exception as e:
+            logger.error(f"流式上传文件失败: {e}, 目标路径: {target_path}/{filename}", exc_info=True)
+            return False
 
-            async with self.session.put(
-                upload_url, data=file_data, headers=headers
-            ) as response:
-                if response.status == 200:
-                    result = await response.json()
-                    if result.get("code") == 200:
-                        return True
-                    else:
-                        logger.error(f"上传失败，服务器返回错误 - code: {result.get('code')}, message: {result.get('message', '未知错误')}, 完整响应: {result}")
-                        return False
+    async def _put(self, data, target_path: str, filename: str, extra_headers: Optional[Dict] = None) -> bool:
+        """调用 /api/fs/put 上传数据"""
+        upload_url = f"{self.base_url}/api/fs/put"
+
+        headers = {
+            "Content-Type": "application/octet-stream",
+            "File-Path": quote(f"{target_path.rstrip('/')}/{filename}", safe="/"),
+        }
+        if extra_headers:
+            headers.update(extra_headers)
+
+        if hasattr(self, "token") and self.token:
+            headers["Authorization"] = self.token
+
+        async with self.session.put(
+            upload_url, data=data, headers=headers
+        ) as response:
+            if response.status == 200:
+                result = await response.json()
+                if result.get("code") == 200:
+                    return True
                 else:
-                    error_text = await response.text()
-                    logger.error(f"上传失败 - HTTP状态: {response.status}, 响应内容: {error_text}, 目标路径: {target_path}/{filename}")
+                    logger.error(f"上传失败，服务器返回错误 - code: {result.get('code')}, message: {result.get('message', '未知错误')}, 完整响应: {result}")
                     return False
-
-        except Exception as e:
-            logger.error(f"上传文件失败: {e}, 文件路径: {file_path}, 目标路径: {target_path}/{filename}", exc_info=True)
-            return False
+            else:
+                error_text = await response.text()
+                logger.error(f"上传失败 - HTTP状态: {response.status}, 响应内容: {error_text}, 目标路径: {target_path}/{filename}")
+                return False
 
     async def mkdir(self, path: str) -> bool:
         """在Openlist创建目录"""
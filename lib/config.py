@@ -1,6 +1,6 @@
 import os
 import json
-from typing import Dict
+from typing import Dict, Optional, Tuple
 from astrbot.api import logger
 from astrbot.api.star import StarTools
 
@@ -38,12 +38,12 @@ class UserConfigManager:
     def load_config(self) -> Dict:
         """从本地文件加载用户配置，若文件不存在则返回默认配置"""
         try:
-            if os.path.exists(self.config_file):
-                with open(self.config_file, "r", encoding="utf-8") as f:
-                    config = json.load(f)
-                merged_config = self.default_config.copy()
-                merged_config.update(config)
-                return merged_config
+            with open(self.config_file, "r", encoding="utf-8") as f:
+                config = json.load(f)
+            merged_config = self.default_config.copy()
+            merged_config.update(config)
+            return merged_config
+        except FileNotFoundError:
             return self.default_config.copy()
         except Exception as e:
             logger.error(f"加载用户 {self.user_id} 配置失败: {e}")
@@ -90,23 +90,38 @@ class GlobalConfigManager:
             "backup_allowed_extensions": "",
             "backup_max_size": 0,
         }
+        # 已解析的配置文件内容：((修改时间, 文件大小), 合并默认值后的配置)
+        self._cache: Optional[Tuple[Tuple[int, int], Dict]] = None
 
     def load_config(self) -> Dict:
-        """从本地文件加载全局配置，若文件不存在则返回默认配置"""
+        """从本地文件加载全局配置，若文件不存在则返回默认配置；文件未变化时复用上次的解析结果"""
         try:
-            if os.path.exists(self.config_file):
+            try:
+                st = os.stat(self.config_file)
+            except FileNotFoundError:
+                return self.default_config.copy()
+            signature = (st.st_mtime_ns, st.st_size)
+            if self._cache is None or self._cache[0] != signature:
                 with open(self.config_file, "r", encoding="utf-8") as f:
                     config = json.load(f)
                 merged_config = self.default_config.copy()
                 merged_config.update(config)
-                return merged_config
-            return self.default_config.copy()
+                self._cache = (signature, merged_config)
+            return self._cache[1].copy()
         except Exception as e:
             logger.error(f"加载全局配置失败: {e}")
             return self.default_config.copy()
 
+    def get_mtime_ns(self) -> Optional[int]:
+        """返回全局配置文件的修改时间（纳秒），文件不存在时返回 None"""
+        try:
+            return os.stat(self.config_file).st_mtime_ns
+        except OSError:
+            return None
+
     def save_config(self, config: Dict):
         """将全局配置保存到本地文件"""
+        self._cache = None
         try:
             with open(self.config_file, "w", encoding="utf-8") as f:
                 json.dump(config, f, ensure_ascii=False, indent=2)
@@ -1,8 +1,14 @@
 import asyncio
+import functools
+import hashlib
+import itertools
 import os
+import re
+import tempfile
 import time
-import chardet
-from typing import List, Dict, Optional
+from collections import Counter, OrderedDict, deque
+from contextlib import asynccontextmanager
+from typing import List, Dict, Optional, Tuple
 import aiohttp
 
 from astrbot.api.event import filter, AstrMessageEvent, MessageChain
@@ -13,6 +19,408 @@ from .lib.client import OpenlistClient
 from .lib.config import UserConfigManager, GlobalConfigManager
 from .lib.cache import CacheManager
 
+# 可通过 /ol config set 修改的配置项（元组保留展示顺序，集合用于查找）
+_CONFIG_KEYS = (
+    "openlist_url", "username", "password", "token",
+    "max_display_files", "public_openlist_url",
+    "fixed_base_directory", "allowed_extensions", "max_preview_size", "text_preview_length",
+    "enable_cache", "cache_duration", "max_download_size", "max_upload_size",
+    "backup_allowed_extensions", "backup_max_size",
+)
+_VALID_CONFIG_KEYS = frozenset(_CONFIG_KEYS)
+
+# 整数配置项的取值范围：键 -> (下限, 上限或 None, 越界提示)
+_INT_CONFIG_RANGES = {
+    "max_display_files": (1, 100, "max_display_files 必须在1-100之间"),
+    "cache_duration": (1, None, "cache_duration 必须大于0"),
+    "backup_max_size": (0, None, "backup_max_size 必须大于等于0"),
+    "max_download_size": (0, None, "max_download_size 必须大于等于0"),
+    "max_upload_size": (0, None, "max_upload_size 必须大于等于0"),
+    "max_preview_size": (-1, None, "max_preview_size 必须大于等于 -1 (-1表示禁用, 0表示不限制)"),
+    "text_preview_length": (1, None, "text_preview_length 必须大于0"),
+}
+_BOOL_CONFIG_KEYS = frozenset({"enable_cache"})
+_TRUE_VALUES = frozenset({"true", "1", "yes", "on"})
+_SECRET_CONFIG_KEYS = frozenset({"password", "token"})
+# 修改后需丢弃按旧凭据登录的池化客户端的配置项
+_CREDENTIAL_CONFIG_KEYS = frozenset({"openlist_url", "username", "password", "token"})
+
+# 下载写盘的分块大小，较大的块可显著减少写入次数
+_DOWNLOAD_CHUNK_SIZE = 256 * 1024
+
+# 合并后用户配置的内存缓存：有效期（秒）与最大用户数
+_USER_CONFIG_CACHE_TTL = 60
+_USER_CONFIG_CACHE_SIZE = 256
+
+# 文件列表中按扩展名显示的图标，未命中时使用 📄
+_EXT_ICON = {
+    ".jpg": "🖼️", ".jpeg": "🖼️", ".png": "🖼️", ".gif": "🖼️", ".bmp": "🖼️",
+    ".mp4": "🎬", ".avi": "🎬", ".mkv": "🎬", ".mov": "🎬",
+    ".mp3": "🎵", ".wav": "🎵", ".flac": "🎵", ".aac": "🎵",
+    ".pdf": "📄",
+    ".doc": "📝", ".docx": "📝",
+    ".zip": "📦", ".rar": "📦", ".7z": "📦",
+}
+
+# 内存中保留的活跃用户状态上限，及闲置多久（秒）后回收
+_USER_STATE_MAX = 2048
+_USER_STATE_IDLE_TTL = 3600
+
+# 文件大小单位表，下标为 bit_length 折算出的 1024 幂次
+_SIZE_UNITS = ((1, "B"), (1 << 10, "KB"), (1 << 20, "MB"), (1 << 30, "GB"))
+
+# 复用的 Openlist 客户端数量上限，及重新登录刷新 token 的间隔（秒）
+_CLIENT_POOL_SIZE = 32
+_CLIENT_POOL_TTL = 3600
+
+# 每个用户保留的上级目录历史深度
+_NAV_HISTORY_MAX = 64
+
+# 已发送的下载临时文件保留时长（秒），留给平台读取后再统一清理
+_TEMP_FILE_TTL = 10
+
+# 扫描群文件时同时请求的文件夹数量上限
+_GROUP_FILES_CONCURRENCY = 8
+
+# 群文件备份时同时进行的下载/上传任务数（不超过共享连接池的单主机连接上限）
+_BACKUP_CONCURRENCY = 8
+
+# 备份时同时向协议端请求群文件下载链接的数量上限
+_BACKUP_URL_CONCURRENCY = 10
+
+# 文本预览编码检测结果缓存（内容摘要 -> (编码, 置信度)）的最大条目数
+_ENCODING_CACHE_SIZE = 256
+_encoding_cache: "OrderedDict[bytes, Tuple[str, float]]" = OrderedDict()
+
+# 恢复任务同时下载的文件数；已下载待发送的文件最多为其两倍
+_RESTORE_CONCURRENCY = 4
+
+# 恢复到群时同时上传的文件数
+_RESTORE_UPLOAD_CONCURRENCY = 2
+
+# 恢复任务扫描 Openlist 目录时同时请求的目录数
+_RESTORE_LIST_CONCURRENCY = 8
+
+# 上传模式无操作自动取消的时长（秒）
+_UPLOAD_WAIT_TTL = 600
+
+# WebUI 配置项与本地全局配置项的对应关系
+_WEBUI_CONFIG_MAPPING = (
+    ("default_openlist_url", "openlist_url"),
+    ("public_openlist_url", "public_openlist_url"),
+    ("default_username", "username"),
+    ("default_password", "password"),
+    ("default_token", "token"),
+    ("fixed_base_directory", "fixed_base_directory"),
+    ("max_display_files", "max_display_files"),
+    ("allowed_extensions", "allowed_extensions"),
+    ("max_preview_size", "max_preview_size"),
+    ("text_preview_length", "text_preview_length"),
+    ("enable_cache", "enable_cache"),
+    ("cache_duration", "cache_duration"),
+    ("max_download_size", "max_download_size"),
+    ("max_upload_size", "max_upload_size"),
+    ("require_user_auth", "require_user_auth"),
+    ("autobackup_groups", "autobackup_groups"),
+    ("backup_allowed_extensions", "backup_allowed_extensions"),
+    ("backup_max_size", "backup_max_size"),
+)
+
+# 扩展名列表类配置项，加载后统一转为 frozenset 以便 O(1) 判断
+_EXTENSION_KEYS = ("allowed_extensions", "backup_allowed_extensions")
+
+# 下载临时文件名中需剔除的字符（保留字母数字、下划线、点、连字符和空格）
+_UNSAFE_FILENAME_RE = re.compile(r"[^\w.\- ]")
+
+# 上传时保留原扩展名的图片格式
+_IMG_EXT = (".png", ".jpg", ".jpeg", ".gif", ".webp", ".bmp")
+
+# 通过 Openlist 接口列出内容的压缩包格式
+_ARCHIVE_EXT = frozenset({".zip", ".tar", ".gz", ".7z", ".rar", ".bz2", ".xz"})
+
+# 支持文本预览的扩展名
+_TEXT_PREVIEW_EXT = frozenset({
+    ".txt", ".md", ".log", ".json", ".xml", ".yaml", ".yml", ".ini", ".conf", ".cfg", ".toml",
+    ".py", ".js", ".java", ".c", ".cpp", ".h", ".go", ".rs", ".php", ".rb", ".sh", ".bash",
+    ".html", ".htm", ".css", ".jsx", ".tsx", ".ts", ".vue", ".sql", ".csv", ".properties", ".env",
+})
+
+# 备份类命令的参数按首字符区分：/ 开头为路径，@ 开头为群号
+_TARGET_ARG_PREFIXES = {"/": "path", "@": "group"}
+
+
+def _remove_if_exists(path: str):
+    """删除临时文件（若存在），供 asyncio.to_thread 调用"""
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+@functools.lru_cache(maxsize=64)
+def _parse_extensions(raw: str) -> frozenset:
+    """将逗号分隔的扩展名字符串解析为小写、带点的集合（按原始字符串缓存）"""
+    exts = (ext.strip().lower() for ext in raw.split(","))
+    return frozenset(ext if ext.startswith(".") else f".{ext}" for ext in exts if ext)
+
+
+def _normalize_extensions(value) -> frozenset:
+    """统一扩展名配置为 frozenset，兼容字符串与列表两种存储形式"""
+    if isinstance(value, str):
+        return _parse_extensions(value)
+    return frozenset(value or ())
+
+
+def _file_ext(name: str) -> str:
+    """取文件名的小写扩展名（含点），规则同 os.path.splitext：开头的点不算扩展名"""
+    i = name.rfind(".")
+    if i <= 0 or (name[0] == "." and not name[:i].lstrip(".")):
+        return ""
+    return name[i:].lower()
+
+
+def _parse_target_args(*args: Optional[str]) -> Tuple[Dict[str, str], Optional[str]]:
+    """解析备份类命令的路径/群号参数（顺序不限），返回 ({"path": 路径, "group": 群号}, 无法识别的参数)"""
+    parsed = {}
+    for arg in args:
+        if not arg: continue
+        slot = _TARGET_ARG_PREFIXES.get(arg[0])
+        if slot is None:
+            return parsed, arg
+        parsed[slot] = arg if slot == "path" else arg[1:]
+    return parsed, None
+
+
+def _group_folder_ids(root_files: Optional[Dict]) -> Dict[str, str]:
+    """从 get_group_root_files 的结果中提取 {文件夹名: 文件夹 ID}"""
+    if not root_files:
+        return {}
+    return {f["folder_name"]: f["folder_id"] for f in root_files.get("folders") or []}
+
+
+def _join_extra(first: str, second: str) -> str:
+    """用 " | " 连接文件列表中的两段附加信息，空段自动省略"""
+    if first and second:
+        return f"{first} | {second}"
+    return first or second
+
+
+def _join_path(parent: str, name: str) -> str:
+    """拼接目录与名称，目录已以斜杠结尾（如根目录）时不再重复添加"""
+    return parent + name if parent.endswith("/") else parent + "/" + name
+
+
+def _is_utf8(data: bytes) -> bool:
+    """判断数据是否为合法 UTF-8（允许末尾被截断的多字节字符）"""
+    try:
+        data.decode("utf-8")
+    except UnicodeDecodeError as e:
+        return e.reason == "unexpected end of data" and e.start >= len(data) - 3
+    return True
+
+
+def _detect_encoding(data: bytes) -> Tuple[str, float]:
+    """检测文本编码，返回 (编码, 置信度)；合法 UTF-8 直接返回，其余按内容摘要缓存 chardet 的结果"""
+    if _is_utf8(data):
+        return "utf-8", 1.0
+    key = hashlib.blake2b(data, digest_size=16).digest()
+    cached = _encoding_cache.get(key)
+    if cached is not None:
+        _encoding_cache.move_to_end(key)
+        return cached
+    # chardet 仅在首次需要检测时才导入
+    import chardet
+
+    detection = chardet.detect(data)
+    result = (detection.get("encoding") or "utf-8", detection.get("confidence") or 0)
+    _encoding_cache[key] = result
+    if len(_encoding_cache) > _ENCODING_CACHE_SIZE:
+        _encoding_cache.popitem(last=False)
+    return result
+
+
+async def _stream_to_file(response: aiohttp.ClientResponse, path: str) -> int:
+    """将响应体按块写入文件（磁盘操作在线程中执行），返回写入的字节数"""
+    written = 0
+    f = await asyncio.to_thread(open, path, "wb")
+    try:
+        async for chunk in response.content.iter_chunked(_DOWNLOAD_CHUNK_SIZE):
+            await asyncio.to_thread(f.write, chunk)
+            written += len(chunk)
+    finally:
+        await asyncio.to_thread(f.close)
+    return written
+
+
+def _create_temp_file(directory: str, prefix: str, suffix: str) -> str:
+    """在指定目录下原子地创建唯一的临时文件并返回路径（目录已在插件初始化时创建，被删除时才重建）"""
+    try:
+        fd, path = tempfile.mkstemp(dir=directory, prefix=prefix, suffix=suffix)
+    except FileNotFoundError:
+        os.makedirs(directory, exist_ok=True)
+        fd, path = tempfile.mkstemp(dir=directory, prefix=prefix, suffix=suffix)
+    os.close(fd)
+    return path
+
+
+async def _read_prefix(session: aiohttp.ClientSession, url: str, limit: int, size: int) -> Tuple[int, bytes]:
+    """读取文件开头至多 limit 字节，返回 (HTTP 状态, 内容)；空文件不带 Range 头，服务器返回 416 时视为空内容"""
+    headers = {"Range": f"bytes=0-{limit - 1}"} if size > 0 and limit > 0 else None
+    async with session.get(url, headers=headers) as resp:
+        if resp.status == 416:
+            return 200, b""
+        if resp.status not in (200, 206):
+            return resp.status, b""
+        buffer = bytearray()
+        async for chunk in resp.content.iter_chunked(_DOWNLOAD_CHUNK_SIZE):
+            buffer += chunk
+            if len(buffer) >= limit:
+                break
+    return resp.status, bytes(buffer[:limit])
+
+
+# /ol help 的静态文本，仅末尾的模式提示随配置变化
+_HELP_BODY = """📚 OpenList 助手帮助
+💡 您也可以使用别名 `/网盘` 代替 `/ol`。
+
+---
+核心导航指令
+---
+▶️ `/ol ls [路径|序号]`
+   - 浏览目录: 列出内容，若文件过多会自动分页。
+     - 示例: `/ol ls` 或 `/ol ls /movies`
+   - 进入子目录:
+     - 示例: `/ol ls 1` (如果1是目录)
+   - 获取链接: 获取文件的下载链接。
+     - 示例: `/ol ls 2` (如果2是文件)
+
+▶️ `/ol next` - 下一页
+▶️ `/ol prev` - 上一页
+
+▶️ `/ol quit`
+   - 返回到上级目录。
+
+---
+文件操作指令
+---
+📥 `/ol download <路径|序号>`
+   - 直接下载: 将文件作为附件发送给您。
+     - 示例: `/ol download 3` (下载列表中的3号文件)
+     - 示例: `/ol download /docs/report.pdf`
+
+🔍 `/ol search <关键词> [路径]`
+   - 搜索文件。注意：搜索依赖服务器索引，可能不是最新的。
+     - 示例: `/ol search "年度报告"`
+
+ℹ️ `/ol info <路径>`
+   - 查看文件或目录的详细信息，不支持序号。
+     - 示例: `/ol info /docs/report.pdf`
+
+👁️ `/ol preview <路径|序号>`
+   - 预览内容: 支持文本文件内容预览或压缩包目录查看。
+     - 示例: `/ol preview 1`
+     - 示例: `/ol preview /data/config.txt`
+
+📂 `/ol mkdir <名称|路径>`
+   - 新建文件夹: 在当前目录或指定路径创建。
+     - 示例: `/ol mkdir new_folder`
+
+🗑️ `/ol rm <路径|序号>`
+   - 删除项目: 删除文件或文件夹（谨慎操作）。
+     - 示例: `/ol rm 4`
+     - 示例: `/ol rm /tmp/old_file.txt`
+
+📤 `/ol upload [cancel]`
+   - `/ol upload`: 在当前目录开启上传模式。
+   - `/ol upload cancel`: 取消上传。
+   - `使用`: 开启后，直接向机器人发送文件或图片即可。
+
+📦 `/ol backup [/目标路径] [@群号]`
+   - 将指定群聊的所有文件递归备份到 Openlist。
+   - 示例: `/ol backup /群备份 @123456`
+   - 提示: 路径须以 `/` 开头，群号须以 `@` 开头。默认备份当前群到根目录。
+
+🔄 `/ol autobackup <enable|disable> [@群号] [/路径]`
+   - 配置群文件自动备份（新上传文件自动同步）。
+   - 示例: `/ol autobackup enable` (开启当前群备份到默认路径)
+   - 示例: `/ol autobackup enable @123456 /backup` (指定群号和路径)
+   - 示例: `/ol autobackup disable @123456` (禁用指定群的自动备份)
+   - 提示: 禁用时无需提供路径。路径须以 `/` 开头，群号须以 `@` 开头。
+
+🚚 `/ol restore <路径> [@群号]`
+   - 将 Openlist 路径中的文件恢复（发送）到目标群组或私聊。
+   - 示例: `/ol restore /backup/group_123456` (恢复到当前会话)
+   - 示例: `/ol restore /docs @987654` (恢复到指定群)
+   - 提示: 目标为群组时会尝试保持一级目录结构。
+
+---
+插件配置指令
+---
+⚙️ `/ol config setup` - 推荐新用户使用，启动交互式配置向导。
+⚙️ `/ol config show` - 显示您当前的配置。
+⚙️ `/ol config set <键> <值>` - 修改配置项。
+⚙️ `/ol config test` - 测试与服务器的连接。
+⚙️ `/ol config clear_cache` - 清除文件列表缓存。
+"""
+
+_HELP_AUTH_MODE = """
+
+👤 当前模式: 用户独立认证
+   - 每位用户都需要使用 `/ol config setup` 单独配置自己的 Openlist 账户信息。"""
+
+_HELP_NEED_SETUP = """
+
+⚠️ 操作提示
+   您尚未完成配置，请发送 `/ol config setup` 开始配置向导。"""
+
+_HELP_GLOBAL_MODE = """
+
+🌐 当前模式: 全局共享
+   - 所有用户共享管理员预设的 Openlist 服务器连接，无需单独配置。"""
+
+_HELP_TAIL = """
+
+💡 通用提示:
+1.  路径区分大小写，以 `/` 开头表示根目录。
+2.  `ls` 获取链接，`download` 直接发送文件。
+3.  管理员可在机器人后台的插件配置页面调整全局设置。"""
+
+# /ol config setup 的配置向导文本
+_SETUP_WIZARD_TEXT = """🛠️ Openlist配置向导
+
+请按以下步骤配置:
+
+1️⃣ 设置Openlist服务器地址:
+   /ol config set openlist_url http://your-server:5244
+
+2️⃣ 设置用户名(可选):
+   /ol config set username your_username
+
+3️⃣ 设置密码(可选):
+   /ol config set password your_password
+
+4️⃣ 测试连接:
+   /ol config test
+
+5️⃣ 开始使用:
+   /ol ls /
+
+💡 如果服务器不需要登录，只需要设置openlist_url即可"""
+
+# /ol upload 开启上传模式时的提示，{path} 为目标目录
+_UPLOAD_PROMPT_TEMPLATE = """📤 上传模式已启动
+
+📂 目标目录: {path}
+
+💡 请直接发送文件或图片，系统会自动上传到此目录
+⏰ 上传模式将在10分钟后自动取消
+
+📋 支持的操作:
+• 直接发送文件 - 上传文件
+• 直接发送图片 - 上传图片
+• /ol upload cancel - 取消上传模式
+• /ol ls - 查看当前目录"""
+
 
 @register(
     "astrbot_plugin_openlistfile",
@@ -29,8 +437,24 @@ class OpenlistPlugin(Star):
         self.global_config_manager = GlobalConfigManager("openlist")
         self.global_config = self.global_config_manager.load_config()
         self.cache_manager = CacheManager("openlist")
+        # 取绝对路径，临时文件路径可直接交给协议端使用
+        data_dir = os.path.abspath(StarTools.get_data_dir("openlist"))
+        self._downloads_dir = os.path.join(data_dir, "downloads")
+        self._backup_temp_dir = os.path.join(data_dir, "temp_backup")
         self.user_navigation_state = {}
         self.user_upload_state = {}
+        self._waiting_users = set()
+        self._connector: Optional[aiohttp.TCPConnector] = None
+        self._http_session: Optional[aiohttp.ClientSession] = None
+        self._client_pool: "OrderedDict[tuple, Tuple[float, OpenlistClient]]" = OrderedDict()
+        self._client_in_use: "Counter[OpenlistClient]" = Counter()
+        self._client_opening: Dict[tuple, "asyncio.Future[OpenlistClient]"] = {}
+        self._user_config_cache: "OrderedDict[str, Tuple[float, Dict]]" = OrderedDict()
+        self._global_config_cache: Optional[Tuple[Optional[int], Dict]] = None
+        self._autobackup_targets: Dict[str, str] = {}
+        self._temp_files: "deque[Tuple[str, float]]" = deque()
+        self._temp_reaper_task: Optional[asyncio.Task] = None
+        self._user_last_seen: "OrderedDict[str, float]" = OrderedDict()
 
     def get_webui_config(self, key: str, default=None):
         """获取WebUI配置项"""
@@ -39,88 +463,347 @@ class OpenlistPlugin(Star):
         return default
 
     def get_global_config(self) -> Dict:
-        """获取整合后的全局配置（WebUI + global_config.json）"""
+        """获取整合后的全局配置（按 global_config.json 修改时间缓存，返回浅拷贝）"""
+        return self._current_global_config().copy()
+
+    def _current_global_config(self) -> Dict:
+        """返回缓存的全局配置；文件有变化时重新整合，并清空由其派生的用户配置缓存"""
+        mtime = self.global_config_manager.get_mtime_ns()
+        cached = self._global_config_cache
+        if cached and cached[0] == mtime:
+            return cached[1]
+        config = self._build_global_config()
+        self._global_config_cache = (mtime, config)
+        self._autobackup_targets = self._build_autobackup_targets(config.get("autobackup_groups", []))
+        self._user_config_cache.clear()
+        return config
+
+    @staticmethod
+    def _build_autobackup_targets(autobackup_groups: List[str]) -> Dict[str, str]:
+        """将 "群号:路径" 形式的自动备份配置转为 群号 -> 目标路径 映射（同一群号以第一条为准）"""
+        targets = {}
+        for item in autobackup_groups:
+            gid, sep, path = item.partition(":")
+            targets.setdefault(gid, path if sep else f"/backup/group_{gid}")
+        return targets
+
+    def _build_global_config(self) -> Dict:
+        """整合 WebUI 配置与 global_config.json"""
         # 直接加载本地配置
         config = self.global_config_manager.load_config()
         
         # 基础配置项映射：如果 WebUI 有值且本地是默认值，则使用 WebUI 的
-        mapping = {
-            "default_openlist_url": "openlist_url",
-            "public_openlist_url": "public_openlist_url",
-            "default_username": "username",
-            "default_password": "password",
-            "default_token": "token",
-            "fixed_base_directory": "fixed_base_directory",
-            "max_display_files": "max_display_files",
-            "allowed_extensions": "allowed_extensions",
-            "max_preview_size": "max_preview_size",
-            "text_preview_length": "text_preview_length",
-            "enable_cache": "enable_cache",
-            "cache_duration": "cache_duration",
-            "max_download_size": "max_download_size",
-            "max_upload_size": "max_upload_size",
-            "require_user_auth": "require_user_auth",
-            "autobackup_groups": "autobackup_groups",
-            "backup_allowed_extensions": "backup_allowed_extensions",
-            "backup_max_size": "backup_max_size",
-        }
-        
-        for webui_key, local_key in mapping.items():
+        for webui_key, local_key in _WEBUI_CONFIG_MAPPING:
             webui_val = self.get_webui_config(webui_key)
             if webui_val is not None:
                 # 如果是列表（autobackup_groups），合并
                 if isinstance(webui_val, list) and local_key == "autobackup_groups":
                     local_val = config.get(local_key, [])
-                    # 简单的去重合并
+                    # 按群号去重合并，本地配置优先，WebUI 中重复的群号也只取第一条
                     combined = list(local_val)
-                    existing_gids = {item.split(":", 1)[0] for item in local_val if ":" in item}
-                    existing_gids.update({item for item in local_val if ":" not in item})
+                    existing_gids = {item.partition(":")[0] for item in local_val}
                     for item in webui_val:
-                        gid = item.split(":", 1)[0] if ":" in item else item
+                        gid = item.partition(":")[0]
                         if gid not in existing_gids:
+                            existing_gids.add(gid)
                             combined.append(item)
                     config[local_key] = combined
                 # 其他项，只有当本地配置是空/默认时才使用 WebUI
                 elif not config.get(local_key):
                     config[local_key] = webui_val
 
-        # 统一将扩展名字符串转为列表
-        for key in ["allowed_extensions", "backup_allowed_extensions"]:
-            if isinstance(config.get(key), str):
-                config[key] = [ext.strip().lower() for ext in config[key].split(",") if ext.strip()]
-                config[key] = [ext if ext.startswith(".") else f".{ext}" for ext in config[key]]
-                
+        # 统一将扩展名配置转为集合
+        for key in _EXTENSION_KEYS:
+            config[key] = _normalize_extensions(config.get(key))
+
         return config
 
     async def initialize(self):
         """插件初始化"""
         logger.info("Openlist文件管理插件已加载")
+        for directory in (self._downloads_dir, self._backup_temp_dir):
+            os.makedirs(directory, exist_ok=True)
+        await self._get_http_session()
+        self._temp_reaper_task = asyncio.create_task(self._temp_file_reaper())
         global_cfg = self.get_global_config()
         default_url = global_cfg.get("openlist_url", "")
         require_auth = global_cfg.get("require_user_auth", True)
         if not default_url and not require_auth:
             logger.warning("Openlist URL未配置，请使用 /ol config 命令配置或在WebUI中配置")
 
+    def _get_connector(self) -> aiohttp.TCPConnector:
+        """获取插件级共享的连接池，API 客户端与文件下载共用，保持长连接"""
+        if self._connector is None or self._connector.closed:
+            self._connector = aiohttp.TCPConnector(
+                limit=64, limit_per_host=16, keepalive_timeout=75, ttl_dns_cache=300, enable_cleanup_closed=True
+            )
+        return self._connector
+
+    async def _get_http_session(self) -> aiohttp.ClientSession:
+        """获取插件级共享的下载会话，复用连接避免每次下载重新握手；连接池重建后关闭旧会话并换用新会话"""
+        connector = self._get_connector()
+        session = self._http_session
+        if session is None or session.closed or session.connector is not connector:
+            self._http_session = aiohttp.ClientSession(connector=connector, connector_owner=False)
+            if session is not None and not session.closed:
+                await session.close()
+        return self._http_session
+
+    @staticmethod
+    def _client_key(user_config: Dict) -> tuple:
+        """OpenlistClient 的连接参数，作为客户端池的键"""
+        return (
+            user_config["openlist_url"],
+            user_config.get("public_openlist_url", ""),
+            user_config.get("username", ""),
+            user_config.get("password", ""),
+            user_config.get("token", ""),
+            user_config.get("fixed_base_directory", ""),
+        )
+
+    async def _get_client(self, user_config: Dict) -> OpenlistClient:
+        """按连接参数复用已登录的 OpenlistClient，避免每条命令重新握手和登录"""
+        key = self._client_key(user_config)
+        now = time.monotonic()
+        pooled = self._client_pool.get(key)
+        if pooled:
+            created_at, client = pooled
+            if now - created_at < _CLIENT_POOL_TTL and client.session and not client.session.closed:
+                self._client_pool.move_to_end(key)
+                return client
+            del self._client_pool[key]
+            await self._retire_client(client)
+
+        # 同一连接参数的并发命令共用一次登录
+        opening = self._client_opening.get(key)
+        if opening is None:
+            opening = asyncio.ensure_future(self._open_client(key))
+            self._client_opening[key] = opening
+            opening.add_done_callback(lambda _: self._client_opening.pop(key, None))
+        return await asyncio.shield(opening)
+
+    async def _open_client(self, key: tuple) -> OpenlistClient:
+        """创建并登录客户端，成功登录的放入池中"""
+        client = OpenlistClient(*key, connector=self._get_connector())
+        await client.open()
+        # 登录失败的客户端不入池，下次命令重新尝试登录
+        if client.token or not (client.username and client.password):
+            self._client_pool[key] = (time.monotonic(), client)
+            while len(self._client_pool) > _CLIENT_POOL_SIZE:
+                _, (_, evicted) = self._client_pool.popitem(last=False)
+                await self._retire_client(evicted)
+        return client
+
+    async def _retire_client(self, client: OpenlistClient):
+        """关闭已移出池的客户端；仍有命令在使用时，由最后一个使用者退出时关闭"""
+        if not self._client_in_use[client]:
+            await client.close()
+
+    @asynccontextmanager
+    async def _openlist_client(self, user_config: Dict):
+        """获取复用的 OpenlistClient，入池的客户端退出时不关闭会话"""
+        client = await self._get_client(user_config)
+        self._client_in_use[client] += 1
+        try:
+            yield client
+        finally:
+            self._client_in_use[client] -= 1
+            if not self._client_in_use[client]:
+                del self._client_in_use[client]
+                pooled = self._client_pool.get(self._client_key(user_config))
+                if not pooled or pooled[1] is not client:
+                    await client.close()
+
+    async def _evict_client(self, user_config: Dict):
+        """将按该配置登录的客户端移出池（配置变更后不再复用旧身份）"""
+        pooled = self._client_pool.pop(self._client_key(user_config), None)
+        if pooled:
+            await self._retire_client(pooled[1])
+
+    async def _close_client_pool(self):
+        """关闭并清空客户端池"""
+        while self._client_pool:
+            _, (_, client) = self._client_pool.popitem(last=False)
+            await client.close()
+
+    @staticmethod
+    def _cache_scope(user_config: Dict) -> str:
+        """目录缓存的身份范围：地址、账号、基础目录与凭据（令牌、密码的哈希）任一不同则缓存互不共享，
+        仅填写他人账号名而凭据不同的用户读不到他人的列表"""
+        credentials = hashlib.sha256(
+            f"{user_config.get('token', '')}\0{user_config.get('password', '')}".encode("utf-8")
+        ).hexdigest()
+        return f"{user_config['openlist_url']}|{user_config.get('username', '')}|{user_config.get('fixed_base_directory', '')}|{credentials}"
+
+    async def _list_dir(
+        self, client: OpenlistClient, user_config: Dict, path: str, refresh: bool = False, quiet: bool = False
+    ) -> Optional[Dict]:
+        """获取完整目录列表；启用缓存时优先读取缓存，refresh 为真时强制从服务器获取并更新缓存，quiet 透传给客户端"""
+        if not refresh:
+            cached = await self._get_cached_dir(user_config, path)
+            if cached is not None:
+                return cached
+        result = await client.list_files(path, per_page=0, quiet=quiet)
+        if result is not None and user_config.get("enable_cache", True):
+            await asyncio.to_thread(self.cache_manager.set_cache, self._cache_scope(user_config), path, result)
+        return result
+
+    async def _get_cached_dir(self, user_config: Dict, path: str) -> Optional[Dict]:
+        """读取未过期的目录缓存，未启用缓存或未命中时返回 None；无需客户端，可在建立连接前调用"""
+        if not user_config.get("enable_cache", True):
+            return None
+        return await asyncio.to_thread(
+            self.cache_manager.get_cache, self._cache_scope(user_config), path, user_config.get("cache_duration", 300)
+        )
+
+    async def _find_cached_entry(self, user_config: Dict, path: str) -> Optional[Dict]:
+        """从父目录的缓存列表中查找路径对应的条目，未缓存或不存在时返回 None"""
+        if path == "/":
+            return None
+        parent, _, name = path.rstrip("/").rpartition("/")
+        cached = await self._get_cached_dir(user_config, parent or "/")
+        if cached is None:
+            return None
+        return next((f for f in cached.get("content") or [] if f.get("name") == name), None)
+
+    @staticmethod
+    def _cache_before_login(user_config: Dict) -> bool:
+        """配置了令牌或密码时缓存范围与凭据绑定，命中即说明这组凭据曾成功列出该目录，可在获取客户端前读取；
+        无凭据时须先获取客户端，再读取缓存"""
+        return bool(user_config.get("token") or user_config.get("password"))
+
+    async def _drop_dir_cache(self, user_config: Dict, path: str):
+        """目录内容变更后删除当前身份范围内的缓存"""
+        await asyncio.to_thread(self.cache_manager.delete_cache, self._cache_scope(user_config), path)
+
+    async def _listing_after_upload(self, user_config: Dict, user_id: str, path: str, name: str, size: int) -> Optional[List[Dict]]:
+        """上传成功后把新文件补入已知的目录列表（缓存或当前导航列表），无需再次请求服务器；均不可用时返回 None"""
+        cached = await self._get_cached_dir(user_config, path)
+        if cached is not None:
+            base = cached.get("content") or []
+        else:
+            nav_state = self._get_user_navigation_state(user_id)
+            if nav_state["current_path"] != path:
+                return None
+            base = nav_state["items"]
+        files = [f for f in base if f.get("name") != name]
+        files.append({"name": name, "size": size, "is_dir": False, "modified": time.strftime("%Y-%m-%dT%H:%M:%S")})
+        if cached is not None:
+            await asyncio.to_thread(
+                self.cache_manager.set_cache, self._cache_scope(user_config), path, {**cached, "content": files, "total": len(files)}
+            )
+        return files
+
+    def _schedule_temp_cleanup(self, path: str):
+        """登记临时文件，到期后由后台任务统一删除"""
+        self._temp_files.append((path, time.monotonic() + _TEMP_FILE_TTL))
+
+    async def _reap_temp_files(self, force: bool = False):
+        """删除已到期（或全部）登记的临时文件"""
+        now = time.monotonic()
+        while self._temp_files and (force or self._temp_files[0][1] <= now):
+            path, _ = self._temp_files.popleft()
+            try:
+                await asyncio.to_thread(_remove_if_exists, path)
+            except OSError as e:
+                logger.debug(f"清理临时文件失败: {e}, 文件: {path}")
+
+    async def _temp_file_reaper(self):
+        """后台定期清理到期的临时文件，并顺带取消超时的上传模式"""
+        while True:
+            await asyncio.sleep(_TEMP_FILE_TTL)
+            await self._reap_temp_files()
+            self._expire_upload_waiting()
+
+    def _upload_wait_expired(self, user_id: str, now: float) -> bool:
+        """上传模式已超时则将其取消，返回是否已取消"""
+        upload_state = self.user_upload_state.get(user_id)
+        if upload_state and upload_state["expires_at"] > now:
+            return False
+        # 直接修改状态，避免后台扫描经由 _get_user_upload_state 刷新用户活跃时间
+        self._waiting_users.discard(user_id)
+        if upload_state:
+            upload_state["waiting"] = False
+            upload_state["target_path"] = "/"
+        logger.info(f"用户 {user_id} 上传模式已自动取消（超时10分钟）")
+        return True
+
+    def _expire_upload_waiting(self):
+        """扫描处于上传模式的用户，取消已超时的"""
+        now = time.monotonic()
+        for user_id in list(self._waiting_users):
+            self._upload_wait_expired(user_id, now)
+
+    def _touch_user(self, user_id: str):
+        """记录用户活跃时间，并按 LRU 上限与闲置时长回收其他用户的内存状态"""
+        now = time.monotonic()
+        self._user_last_seen[user_id] = now
+        self._user_last_seen.move_to_end(user_id)
+        while self._user_last_seen:
+            oldest_id, last_seen = next(iter(self._user_last_seen.items()))
+            if len(self._user_last_seen) <= _USER_STATE_MAX and now - last_seen <= _USER_STATE_IDLE_TTL:
+                break
+            self._evict_user_state(oldest_id)
+
+    def _evict_user_state(self, user_id: str):
+        """清除用户的导航、上传、配置等内存状态"""
+        self._user_last_seen.pop(user_id, None)
+        self.user_navigation_state.pop(user_id, None)
+        self.user_config_managers.pop(user_id, None)
+        self._user_config_cache.pop(user_id, None)
+        self._waiting_users.discard(user_id)
+        self.user_upload_state.pop(user_id, None)
+
     def get_user_config_manager(self, user_id: str) -> UserConfigManager:
         """获取用户配置管理器"""
+        self._touch_user(user_id)
         if user_id not in self.user_config_managers:
             self.user_config_managers[user_id] = UserConfigManager("openlist", user_id)
         return self.user_config_managers[user_id]
 
     def get_user_config(self, user_id: str) -> Dict:
-        """获取用户配置"""
-        global_cfg = self.get_global_config()
+        """获取用户配置（带短时缓存，返回浅拷贝）"""
+        self._current_global_config()
+        now = time.monotonic()
+        cached = self._user_config_cache.get(user_id)
+        if cached and now - cached[0] < _USER_CONFIG_CACHE_TTL:
+            self._user_config_cache.move_to_end(user_id)
+            return cached[1].copy()
+
+        config = self._build_user_config(user_id)
+        self._user_config_cache[user_id] = (now, config)
+        self._user_config_cache.move_to_end(user_id)
+        while len(self._user_config_cache) > _USER_CONFIG_CACHE_SIZE:
+            self._user_config_cache.popitem(last=False)
+        return config.copy()
+
+    def _invalidate_user_config(self, user_id: str = None):
+        """使用户配置缓存失效，未指定用户时清空全部"""
+        if user_id is None:
+            self._global_config_cache = None
+            self._user_config_cache.clear()
+        else:
+            self._user_config_cache.pop(user_id, None)
+
+    def _build_user_config(self, user_id: str) -> Dict:
+        """合并全局配置与用户配置"""
+        # 缓存中的全局配置在此只读；get_user_config 对外返回的是浅拷贝
+        global_cfg = self._current_global_config()
         if not global_cfg.get("require_user_auth", True):
             return global_cfg
             
-        user_config = self.get_user_config_manager(user_id).load_config()
-        
-        # 简单的合并：用户配置优先，如果用户配置为空则使用全局配置
-        final_cfg = global_cfg.copy()
-        for k, v in user_config.items():
-            # 只要用户设置了非空且非默认值，就覆盖全局
-            if v and v != self.get_user_config_manager(user_id).default_config.get(k):
-                final_cfg[k] = v
+        manager = self.get_user_config_manager(user_id)
+        default_config = manager.default_config
+
+        # 简单的合并：用户配置优先，只要用户设置了非空且非默认值，就覆盖全局
+        overrides = {k: v for k, v in manager.load_config().items() if v and v != default_config.get(k)}
+        if not overrides:
+            return global_cfg
+
+        final_cfg = {**global_cfg, **overrides}
+        for key in _EXTENSION_KEYS:
+            if key in overrides:
+                final_cfg[key] = _normalize_extensions(overrides[key])
                 
         return final_cfg
 
@@ -130,30 +813,55 @@ class OpenlistPlugin(Star):
 
     def _get_user_navigation_state(self, user_id: str) -> Dict:
         """获取用户导航状态"""
+        self._touch_user(user_id)
         if user_id not in self.user_navigation_state:
             self.user_navigation_state[user_id] = {
                 "current_path": "/",
+                "current_path_stripped": "",
                 "items": [],
-                "parent_paths": [],
+                "parent_paths": deque(maxlen=_NAV_HISTORY_MAX),
                 "current_page": 1,
             }
         return self.user_navigation_state[user_id]
 
-    def _update_user_navigation_state(self, user_id: str, path: str, items: List[Dict]):
+    def _update_user_navigation_state(self, user_id: str, path: str, items: List[Dict], user_config: Dict):
         """更新用户导航状态"""
         nav_state = self._get_user_navigation_state(user_id)
         if path != nav_state["current_path"]:
-            if self._is_forward_navigation(nav_state["current_path"], path):
+            if self._is_forward_navigation(nav_state["current_path_stripped"], path):
                 nav_state["parent_paths"].append(nav_state["current_path"])
-            nav_state["current_path"] = path
+            self._set_current_path(nav_state, path)
             nav_state["current_page"] = 1
-        nav_state["items"] = items
+        self._set_nav_items(nav_state, items, user_config)
 
-    def _is_forward_navigation(self, current_path: str, new_path: str) -> bool:
-        """判断是否是前进导航"""
-        current = current_path.rstrip("/")
-        new = new_path.rstrip("/")
-        return new.startswith(current + "/") if current != "/" else new.startswith("/")
+    def _reset_navigation(self, user_id: str, path: str, items: List[Dict], user_config: Dict):
+        """清空返回历史，将导航状态重置到指定路径的第一页"""
+        nav_state = self._get_user_navigation_state(user_id)
+        nav_state["parent_paths"].clear()
+        self._set_current_path(nav_state, path)
+        nav_state["current_page"] = 1
+        self._set_nav_items(nav_state, items, user_config)
+
+    def _set_nav_items(self, nav_state: Dict, items: List[Dict], user_config: Dict):
+        """写入当前列表，并预先计算分页信息，翻页时无需再读配置和重新计算"""
+        page_size = user_config.get("max_display_files", 20)
+        nav_state["items"] = items
+        nav_state["page_size"] = page_size
+        nav_state["total_pages"] = (len(items) + page_size - 1) // page_size
+
+    def _set_current_path(self, nav_state: Dict, path: str):
+        """设置当前路径，同时缓存去掉末尾斜杠的形式供导航判断使用"""
+        nav_state["current_path"] = path
+        nav_state["current_path_stripped"] = path.rstrip("/")
+
+    def _is_forward_navigation(self, current_stripped: str, new_path: str) -> bool:
+        """判断是否是前进导航（current_stripped 为已去掉末尾斜杠的当前路径，根目录为空串）"""
+        if not current_stripped:
+            return new_path.startswith("/")
+        # 等价于 new_stripped.startswith(current_stripped + "/")，但不构造拼接后的临时字符串
+        new_stripped = new_path.rstrip("/")
+        n = len(current_stripped)
+        return len(new_stripped) > n and new_stripped[n] == "/" and new_stripped.startswith(current_stripped)
 
     def _get_item_by_number(self, user_id: str, number: int) -> Optional[Dict]:
         """根据序号获取文件或目录项"""
@@ -165,22 +873,61 @@ class OpenlistPlugin(Star):
 
     def _get_user_upload_state(self, user_id: str) -> Dict:
         """获取用户上传状态"""
+        self._touch_user(user_id)
         if user_id not in self.user_upload_state:
-            self.user_upload_state[user_id] = {"waiting": False, "target_path": "/"}
+            self.user_upload_state[user_id] = {"waiting": False, "target_path": "/", "expires_at": 0.0}
         return self.user_upload_state[user_id]
 
     def _set_user_upload_waiting(self, user_id: str, waiting: bool, target_path: str = "/"):
-        """设置用户上传等待状态"""
+        """设置用户上传等待状态，进入等待时重新计算自动取消的截止时间"""
         upload_state = self._get_user_upload_state(user_id)
         upload_state["waiting"] = waiting
+        if waiting:
+            upload_state["expires_at"] = time.monotonic() + _UPLOAD_WAIT_TTL
+            self._waiting_users.add(user_id)
+        else:
+            self._waiting_users.discard(user_id)
         upload_state["target_path"] = target_path
 
-    def _format_file_size(self, size: int) -> str:
-        """格式化文件大小"""
-        if size < 1024: return f"{size}B"
-        elif size < 1024 * 1024: return f"{size / 1024:.1f}KB"
-        elif size < 1024 * 1024 * 1024: return f"{size / (1024 * 1024):.1f}MB"
-        else: return f"{size / (1024 * 1024 * 1024):.1f}GB"
+    @staticmethod
+    def _strip_base(path: str, base: str) -> str:
+        """去掉服务器返回路径中的固定基础目录前缀，转换为用户视角的路径"""
+        if not base or not path.startswith(base):
+            return path
+        path = path[len(base):]
+        if not path: return "/"
+        return path if path.startswith("/") else "/" + path
+
+    @staticmethod
+    @functools.lru_cache(maxsize=4096)
+    def _format_file_size(size: int) -> str:
+        """格式化文件大小（按二进制位数直接定位单位；纯函数，结果按字节数缓存）"""
+        idx = max(0, min(3, (int(size).bit_length() - 1) // 10))
+        if idx == 0: return f"{size}B"
+        divisor, unit = _SIZE_UNITS[idx]
+        return f"{size / divisor:.1f}{unit}"
+
+    def _format_file_row(self, number: int, item: Dict, is_search_result: bool, fixed_base_dir: str) -> str:
+        """格式化列表中的一行（含序号、图标、大小及日期或所在目录）"""
+        name = item.get("name", "")
+        size = item.get("size", 0)
+        modified = item.get("modified", "")
+        is_dir = item.get("is_dir", False)
+
+        icon = "📂" if is_dir else _EXT_ICON.get(_file_ext(name), "📄")
+
+        size_info = f"💾 {self._format_file_size(size)}" if not is_dir or size > 0 else ""
+        if is_search_result:
+            parent = item.get("parent", "")
+            extra = _join_extra(f"📍 {self._strip_base(parent, fixed_base_dir)}" if parent else "", size_info)
+        else:
+            modified_date_part = modified.split('T')[0] if modified else ''
+            extra = _join_extra(size_info, f"📅 {modified_date_part}" if modified_date_part else "")
+
+        row = f"{number:2d}. {icon} {name}{'/' if is_dir else ''}\n"
+        if extra:
+            row += f"      {extra}\n"
+        return row
 
     def _format_file_list(self, files: List[Dict], current_path: str, user_config: Dict, user_id: str = None) -> str:
         """格式化文件列表或搜索结果"""
@@ -191,80 +938,58 @@ class OpenlistPlugin(Star):
 
         nav_state = self._get_user_navigation_state(user_id)
         current_page = nav_state.get("current_page", 1)
-        max_files_per_page = user_config.get("max_display_files", 20)
         total_items = len(files)
-        total_pages = (total_items + max_files_per_page - 1) // max_files_per_page
+        if nav_state.get("items") is files:
+            max_files_per_page = nav_state["page_size"]
+            total_pages = nav_state["total_pages"]
+        else:
+            max_files_per_page = user_config.get("max_display_files", 20)
+            total_pages = (total_items + max_files_per_page - 1) // max_files_per_page
         start_index = (current_page - 1) * max_files_per_page
         end_index = start_index + max_files_per_page
-        items_to_display = files[start_index:end_index]
-
-        result = f"{title}\n\n"
 
-        dirs_count = 0
-        files_only_count = 0
-        if not is_search_result:
-            dirs_count = len([f for f in files if f.get("is_dir", False)])
-            files_only_count = total_items - dirs_count 
-
-        for i, item in enumerate(items_to_display, start=start_index + 1):
-            name = item.get("name", "")
-            size = item.get("size", 0)
-            modified = item.get("modified", "")
-            is_dir = item.get("is_dir", False)
-
-            if is_dir: icon = "📂"
-            else:
-                ext = os.path.splitext(name)[1].lower()
-                if ext in [".jpg", ".jpeg", ".png", ".gif", ".bmp"]: icon = "🖼️"
-                elif ext in [".mp4", ".avi", ".mkv", ".mov"]: icon = "🎬"
-                elif ext in [".mp3", ".wav", ".flac", ".aac"]: icon = "🎵"
-                elif ext in [".pdf"]: icon = "📄"
-                elif ext in [".doc", ".docx"]: icon = "📝"
-                elif ext in [".zip", ".rar", ".7z"]: icon = "📦"
-                else: icon = "📄"
-
-            result += f"{i:2d}. {icon} {name}{'/' if is_dir else ''}\n"
-
-            extra_info = []
-            if is_search_result:
-                parent = item.get("parent", "")
-                if parent:
-                    fixed_base_dir = user_config.get("fixed_base_directory", "")
-                    if fixed_base_dir and parent.startswith(fixed_base_dir):
-                        parent = parent[len(fixed_base_dir):]
-                        if not parent: parent = "/"
-                        elif not parent.startswith("/"): parent = "/" + parent
-                    extra_info.append(f"📍 {parent}")
-                if not is_dir or size > 0:
-                    extra_info.append(f"💾 {self._format_file_size(size)}")
-            else:
-                if not is_dir or size > 0:
-                    extra_info.append(f"💾 {self._format_file_size(size)}")
+        parts = [f"{title}\n\n"]
+        fixed_base_dir = user_config.get("fixed_base_directory", "")
 
-                modified_date_part = modified.split('T')[0] if modified else ''
-                if modified_date_part:
-                    extra_info.append(f"📅 {modified_date_part}")
+        # 每行文本只与列表内容相关，按列表对象缓存，翻回已看过的页时直接复用
+        cached_rows = nav_state.get("rows")
+        if cached_rows and cached_rows[0] is files:
+            rows = cached_rows[1]
+        else:
+            rows = [None] * total_items
+            nav_state["rows"] = (files, rows)
 
-            if extra_info:
-                result += f"      {' | '.join(extra_info)}\n"
+        for idx in range(start_index, min(end_index, total_items)):
+            row = rows[idx]
+            if row is None:
+                row = rows[idx] = self._format_file_row(idx + 1, files[idx], is_search_result, fixed_base_dir)
+            parts.append(row)
 
-        result += f"\n📄 第 {current_page} / {total_pages} 页"
+        parts.append(f"\n📄 第 {current_page} / {total_pages} 页")
         if is_search_result:
-            result += f" | 📊 总计: {total_items} 个结果"
+            parts.append(f" | 📊 总计: {total_items} 个结果")
         else:
-            dirs_count = len([f for f in files if f.get("is_dir", False)])
+            # 文件夹数量只随列表变化，按列表对象缓存，翻页时无需再遍历全部条目
+            cached_count = nav_state.get("dirs_count")
+            if cached_count and cached_count[0] is files:
+                dirs_count = cached_count[1]
+            else:
+                dirs_count = 0
+                for f in files:
+                    dirs_count += bool(f.get("is_dir", False))
+                nav_state["dirs_count"] = (files, dirs_count)
             files_only_count = total_items - dirs_count
-            result += f" | 📊 总计: {dirs_count} 个文件夹, {files_only_count} 个文件"
+            parts.append(f" | 📊 总计: {dirs_count} 个文件夹, {files_only_count} 个文件")
 
-        result += f"\n\n💡 快速导航:"
-        result += f"\n   • /ol ls <序号> - 进入目录/获取链接"
-        result += f"\n   • /ol download <序号> - 下载并发送文件"
+        parts.append("\n\n💡 快速导航:")
+        parts.append("\n   • /ol ls <序号> - 进入目录/获取链接")
+        parts.append("\n   • /ol download <序号> - 下载并发送文件")
         if not is_search_result:
-             result += f"\n   • /ol quit - 返回上级目录"
+            parts.append("\n   • /ol quit - 返回上级目录")
         if total_pages > 1:
-            result += f"\n   • /ol prev - ⬅️ 上一页"
-            result += f"\n   • /ol next - ➡️ 下一页"
-        return result
+            parts.append("\n   • /ol prev - ⬅️ 上一页")
+            parts.append("\n   • /ol next - ➡️ 下一页")
+        return "".join(parts)
 
     async def _download_file(self, event: AstrMessageEvent, file_item: Dict, user_config: Dict, full_path_override: str = None):
         """下载文件并作为附件发送给用户"""
@@ -283,52 +1008,59 @@ class OpenlistPlugin(Star):
             else:
                 parent_path = file_item.get("parent")
                 if parent_path:
-                    fixed_base_dir = user_config.get("fixed_base_directory", "")
-                    if fixed_base_dir and parent_path.startswith(fixed_base_dir):
-                        parent_path = parent_path[len(fixed_base_dir):]
-                        if not parent_path: parent_path = "/"
-                        elif not parent_path.startswith("/"): parent_path = "/" + parent_path
-                    file_path = f"{parent_path.rstrip('/')}/{file_name}"
+                    parent_path = self._strip_base(parent_path, user_config.get("fixed_base_directory", ""))
+                    file_path = _join_path(parent_path, file_name)
                 else:
                     nav_state = self._get_user_navigation_state(user_id)
                     current_path = nav_state["current_path"]
-                    if current_path.endswith("/"): file_path = f"{current_path}{file_name}"
-                    else: file_path = f"{current_path}/{file_name}"
+                    file_path = _join_path(current_path, file_name)
 
-            async with OpenlistClient(user_config["openlist_url"], user_config.get("public_openlist_url", ""), user_config.get("username", ""), user_config.get("password", ""), user_config.get("token", ""), user_config.get("fixed_base_directory", "")) as client:
+            async with self._openlist_client(user_config) as client:
                 download_url = await client.get_download_url(file_path)
-                if not download_url:
-                    yield event.plain_result("❌ 无法获取下载链接")
-                    return
-                downloads_dir = os.path.join(StarTools.get_data_dir("openlist"), "downloads")
-                os.makedirs(downloads_dir, exist_ok=True)
-                safe_filename = "".join(c for c in file_name if c.isalnum() or c in "._- ")[:100]
-                temp_file_path = os.path.join(downloads_dir, f"{user_id}_{int(time.time())}_{safe_filename}")
+            if not download_url:
+                yield event.plain_result("❌ 无法获取下载链接")
+                return
+            await self._reap_temp_files()
+            safe_filename = _UNSAFE_FILENAME_RE.sub("", file_name)[:100]
+            temp_file_path = await asyncio.to_thread(_create_temp_file, self._downloads_dir, f"{user_id}_", f"_{safe_filename}")
+            sent = False
+            try:
                 yield event.plain_result(f"📥 开始下载: {file_name}\n💾 大小: {self._format_file_size(file_size)}")
-                async with aiohttp.ClientSession() as session:
-                    async with session.get(download_url) as response:
-                        if response.status == 200:
-                            with open(temp_file_path, "wb") as f:
-                                downloaded = 0
-                                async for chunk in response.content.iter_chunked(8192):
-                                    f.write(chunk)
-                                    downloaded += len(chunk)
-                                    if (file_size > 10 * 1024 * 1024 and downloaded % (10 * 1024 * 1024) < 8192):
-                                        progress = (downloaded / file_size) * 100
-                                        yield event.plain_result(f"📥 下载进度: {progress:.1f}% ({self._format_file_size(downloaded)}/{self._format_file_size(file_size)})")
-                            yield event.plain_result(f"✅ 下载完成，正在发送文件...")
-                            file_component = File(name=file_name, file=temp_file_path)
-                            yield event.chain_result([file_component])
-                            async def cleanup_file():
-                                await asyncio.sleep(10)
-                                try:
-                                    if os.path.exists(temp_file_path): os.remove(temp_file_path)
-                                except: pass
-                            asyncio.create_task(cleanup_file())
-                        else:
-                            error_text = await response.text()
-                            logger.error(f"用户 {user_id} 下载文件失败 - HTTP状态: {response.status}, 响应: {error_text}, 文件: {file_name}, URL: {download_url}")
-                            yield event.plain_result(f"❌ 下载失败: HTTP {response.status}\n💡 提示: 管理员可在后台日志中查看详细错误信息")
+                session = await self._get_http_session()
+                async with session.get(download_url) as response:
+                    if response.status == 200:
+                        # 超过 10MB 的文件每下载 10MB 汇报一次进度
+                        report_step = 10 * 1024 * 1024
+                        report_progress = file_size > report_step
+                        next_report_at = report_step
+                        total_str = self._format_file_size(file_size)
+                        f = await asyncio.to_thread(open, temp_file_path, "wb")
+                        try:
+                            downloaded = 0
+                            async for chunk in response.content.iter_chunked(_DOWNLOAD_CHUNK_SIZE):
+                                await asyncio.to_thread(f.write, chunk)
+                                downloaded += len(chunk)
+                                if report_progress and downloaded >= next_report_at:
+                                    next_report_at += report_step
+                                    # 实际下载量可能超过列表中记录的大小，进度最多显示 100%
+                                    progress = min(downloaded / file_size * 100, 100)
+                                    yield event.plain_result(f"📥 下载进度: {progress:.1f}% ({self._format_file_size(downloaded)}/{total_str})")
+                        finally:
+                            await asyncio.to_thread(f.close)
+                        yield event.plain_result(f"✅ 下载完成，正在发送文件...")
+                        file_component = File(name=file_name, file=temp_file_path)
+                        sent = True
+                        yield event.chain_result([file_component])
+                    else:
+                        error_text = await response.text()
+                        logger.error(f"用户 {user_id} 下载文件失败 - HTTP状态: {response.status}, 响应: {error_text}, 文件: {file_name}, URL: {download_url}")
+                        yield event.plain_result(f"❌ 下载失败: HTTP {response.status}\n💡 提示: 管理员可在后台日志中查看详细错误信息")
+            finally:
+                # 已发送的文件延迟清理，留给平台读取；失败时立即删除
+                if sent:
+                    self._schedule_temp_cleanup(temp_file_path)
+                else:
+                    await asyncio.to_thread(_remove_if_exists, temp_file_path)
         except Exception as e:
             logger.error(f"用户 {user_id} 下载文件失败: {e}, 文件: {file_name}, 路径: {file_path}", exc_info=True)
             yield event.plain_result(f"❌ 下载失败: {str(e)}\n💡 提示: 管理员可在后台日志中查看详细错误信息")
@@ -336,7 +1068,6 @@ class OpenlistPlugin(Star):
     async def _get_and_send_download_link(self, event: AstrMessageEvent, item: Dict, user_config: Dict, full_path: str = None):
         """获取指定项目的文件链接并发送"""
         user_id = event.get_sender_id()
-        yield event.plain_result(f"🔗 正在获取文件链接: {item.get('name', '')}...")
 
         # 如果提供了 full_path，则直接使用；否则，根据 item 信息构建路径
         if full_path:
@@ -345,18 +1076,23 @@ class OpenlistPlugin(Star):
             nav_state = self._get_user_navigation_state(user_id)
             file_name = item.get("name", "")
             parent_path = item.get("parent", nav_state.get("current_path", "/"))
+            if item.get("parent"):
+                parent_path = self._strip_base(parent_path, user_config.get("fixed_base_directory", ""))
 
-            fixed_base_dir = user_config.get("fixed_base_directory", "")
-            if item.get("parent") and fixed_base_dir and parent_path.startswith(fixed_base_dir):
-                parent_path = parent_path[len(fixed_base_dir):]
-                if not parent_path: parent_path = "/"
-                elif not parent_path.startswith("/"): parent_path = "/" + parent_path
-
-            file_path = f"{parent_path.rstrip('/')}/{file_name}"
+            file_path = _join_path(parent_path, file_name)
 
         try:
-            async with OpenlistClient(user_config["openlist_url"], user_config.get("public_openlist_url", ""), user_config.get("username", ""), user_config.get("password", ""), user_config.get("token", ""), user_config.get("fixed_base_directory", "")) as client:
-                download_url = await client.get_download_url(file_path)
+            async with self._openlist_client(user_config) as client:
+                # 链接很快返回时直接发送结果，超时才先发送进度提示
+                url_task = asyncio.ensure_future(client.get_download_url(file_path))
+                try:
+                    done, _ = await asyncio.wait({url_task}, timeout=0.3)
+                    if not done:
+                        yield event.plain_result(f"🔗 正在获取文件链接: {item.get('name', '')}...")
+                    download_url = await url_task
+                finally:
+                    # 生成器被提前关闭或出错时取消尚未完成的请求，避免遗留任务
+                    url_task.cancel()
                 if download_url:
                     name = item.get("name", "")
                     size = item.get("size", 0)
@@ -376,6 +1112,15 @@ class OpenlistPlugin(Star):
     @filter.event_message_type(filter.EventMessageType.GROUP_MESSAGE, priority=2)
     async def handle_group_file_upload(self, event: AstrMessageEvent):
         """处理群文件上传事件（自动备份）"""
+        # 先按群号判断是否开启了自动备份，绝大多数群消息到此即返回
+        group_id = str(event.message_obj.group_id or "")
+        if not group_id:
+            return
+        self._current_global_config()
+        target_path = self._autobackup_targets.get(group_id)
+        if not target_path:
+            return
+
         raw_event_data = event.message_obj.raw_message
         message_list = raw_event_data.get("message")
         if not isinstance(message_list, list):
@@ -400,27 +1145,7 @@ class OpenlistPlugin(Star):
                         file_size = None
                 
                 # 命中文件，开始执行自动备份检查
-                group_id = str(event.message_obj.group_id)
-                if not group_id:
-                    return
-                
                 global_cfg = self.get_global_config()
-                autobackup_groups = global_cfg.get("autobackup_groups", [])
-                
-                target_path = None
-                for item in autobackup_groups:
-                    if ":" in item:
-                        gid, path = item.split(":", 1)
-                        if gid == group_id:
-                            target_path = path
-                            break
-                    elif item == group_id:
-                        target_path = f"/backup/group_{group_id}"
-                        break
-                
-                if not target_path:
-                    return
-                
                 user_id = event.get_sender_id()
                 user_config = self.get_user_config(user_id)
                 
@@ -433,53 +1158,44 @@ class OpenlistPlugin(Star):
                     return
                 
                 # 预先检查大小限制 (从事件数据获取)
+                max_size_mb = user_config.get("backup_max_size", 0)
+                max_size = max_size_mb * 1024 * 1024
                 if file_size is not None:
-                    max_size_mb = user_config.get("backup_max_size", 0)
-                    if max_size_mb > 0 and file_size > (max_size_mb * 1024 * 1024):
+                    if max_size_mb > 0 and file_size > max_size:
                         logger.info(f"⏭️ [自动备份] 文件 {file_name} 超过限制 {max_size_mb}MB (事件报送大小: {file_size})，跳过。")
                         return
 
-                # 获取对应的 File 组件
-                file_component = None
-                for msg in event.get_messages():
-                    if isinstance(msg, File):
-                        file_component = msg
-                        break
-                
-                if not file_component:
-                    return
-                
-                # 使用配置中的备份过滤条件
+                # 使用配置中的备份过滤条件（先做廉价的后缀判断，再查找组件）
                 allowed_exts = user_config.get("backup_allowed_extensions", [])
                 if allowed_exts:
-                    ext = os.path.splitext(file_name.lower())[1]
+                    ext = _file_ext(file_name)
                     if ext not in allowed_exts:
                         logger.info(f"⏭️ [自动备份] 文件 {file_name} 后缀 {ext} 不在允许范围内，跳过。")
                         return
+
+                # 获取对应的 File 组件
+                file_component = next((msg for msg in event.get_messages() if isinstance(msg, File)), None)
+                if not file_component:
+                    return
                 
                 try:
                     file_path = await file_component.get_file()
-                    if not file_path or not os.path.exists(file_path):
+                    # 一次 stat 同时完成存在性检查和取实际下载大小
+                    try:
+                        actual_size = (await asyncio.to_thread(os.stat, file_path)).st_size if file_path else None
+                    except FileNotFoundError:
+                        actual_size = None
+                    if actual_size is None:
                         logger.error(f"❌ [自动备份] 无法获取文件路径: {file_name}")
                         return
                     
                     try:
-                        # 再次确认实际下载的文件大小
-                        actual_size = os.path.getsize(file_path)
-                        max_size_mb = user_config.get("backup_max_size", 0)
-                        if max_size_mb > 0 and actual_size > (max_size_mb * 1024 * 1024):
+                        if max_size_mb > 0 and actual_size > max_size:
                             logger.info(f"⏭️ [自动备份] 文件 {file_name} 实际下载大小 {actual_size} 超过限制 {max_size_mb}MB，跳过。")
                             return
                         
                         logger.info(f"🚀 [自动备份] 发现新文件: {file_name} -> {target_path}")
-                        async with OpenlistClient(
-                            user_config["openlist_url"], 
-                            user_config.get("public_openlist_url", ""), 
-                            user_config.get("username", ""), 
-                            user_config.get("password", ""), 
-                            user_config.get("token", ""), 
-                            user_config.get("fixed_base_directory", "")
-                        ) as client:
+                        async with self._openlist_client(user_config) as client:
                             await client.mkdir(target_path)
                             success = await client.upload_file(file_path, target_path, file_name)
                             if success:
@@ -487,8 +1203,7 @@ class OpenlistPlugin(Star):
                             else:
                                 logger.error(f"❌ [自动备份] 文件 {file_name} 上传失败。")
                     finally:
-                        if os.path.exists(file_path):
-                            os.remove(file_path)
+                        await asyncio.to_thread(_remove_if_exists, file_path)
                     
                 except Exception as e:
                     logger.error(f"❌ [自动备份] 处理文件 {file_name} 出错: {e}", exc_info=True)
@@ -519,12 +1234,16 @@ class OpenlistPlugin(Star):
 
         try:
             file_path = await file_component.get_file()
-            if not file_path or not os.path.exists(file_path):
+            # 一次 stat 同时完成存在性检查和取大小
+            try:
+                file_size = (await asyncio.to_thread(os.stat, file_path)).st_size if file_path else None
+            except FileNotFoundError:
+                file_size = None
+            if file_size is None:
                 yield event.plain_result("❌ 无法获取文件，请重新发送")
                 return
 
             try:
-                file_size = os.path.getsize(file_path)
                 max_upload_size_mb = user_config.get("max_upload_size", 100)
                 max_upload_size = max_upload_size_mb * 1024 * 1024
                 if file_size > max_upload_size:
@@ -533,35 +1252,49 @@ class OpenlistPlugin(Star):
                     return
 
                 yield event.plain_result(f"📤 开始上传: {file_name}\n💾 大小: {self._format_file_size(file_size)}\n📂 目标: {target_path}")
-                async with OpenlistClient(user_config["openlist_url"], user_config.get("public_openlist_url", ""), user_config.get("username", ""), user_config.get("password", ""), user_config.get("token", ""), user_config.get("fixed_base_directory", "")) as client:
+                async with self._openlist_client(user_config) as client:
                     success = await client.upload_file(file_path, target_path, file_name)
                     if success:
-                        yield event.plain_result(f"✅ 上传成功!\n📄 文件: {file_name}\n📂 路径: {target_path}")
-                        self._set_user_upload_waiting(user_id, False)
-                        result = await client.list_files(target_path)
-                        if result:
-                            files = result.get("content", [])
-                            self._update_user_navigation_state(user_id, target_path, files)
+                        # 优先在已知列表中补入新文件；没有可用列表时才刷新，并与成功提示同时进行
+                        files = await self._listing_after_upload(user_config, user_id, target_path, file_name, file_size)
+                        list_task = None if files is not None else asyncio.ensure_future(
+                            self._list_dir(client, user_config, target_path, refresh=True)
+                        )
+                        try:
+                            yield event.plain_result(f"✅ 上传成功!\n📄 文件: {file_name}\n📂 路径: {target_path}")
+                            self._set_user_upload_waiting(user_id, False)
+                            if list_task is not None:
+                                result = await list_task
+                                files = (result.get("content") or []) if result else None
+                        finally:
+                            # 提前结束时取消尚未完成的刷新，避免遗留任务
+                            if list_task is not None:
+                                list_task.cancel()
+                        if files is not None:
+                            self._update_user_navigation_state(user_id, target_path, files, user_config)
                             formatted_list = self._format_file_list(files, target_path, user_config, user_id)
                             yield event.plain_result(f"📁 当前目录已更新:\n\n{formatted_list}")
                     else:
                         yield event.plain_result(f"❌ 上传失败，请检查网络连接和权限\n💡 提示: 管理员可在后台日志中查看详细错误信息")
             finally:
-                if os.path.exists(file_path):
-                    os.remove(file_path)
+                await asyncio.to_thread(_remove_if_exists, file_path)
         except Exception as e:
             logger.error(f"用户 {user_id} 上传文件失败: {e}", exc_info=True)
             yield event.plain_result(f"❌ 上传失败: {str(e)}\n💡 提示: 管理员可在后台日志中查看详细错误信息")
             self._set_user_upload_waiting(user_id, False)
 
-    async def _get_group_files_recursive(self, bot, group_id: int, folder_id: str = "/", current_path: str = "") -> List[Dict]:
-        """递归获取群文件列表"""
+    async def _get_group_files_recursive(self, bot, group_id: int, folder_id: str = "/", current_path: str = "",
+                                         semaphore: Optional[asyncio.Semaphore] = None) -> List[Dict]:
+        """递归获取群文件列表，同级文件夹并发获取（由 semaphore 限制总并发数）"""
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(_GROUP_FILES_CONCURRENCY)
         all_files = []
         try:
-            if folder_id == "/":
-                res = await bot.api.call_action("get_group_root_files", group_id=group_id)
-            else:
-                res = await bot.api.call_action("get_group_files_by_folder", group_id=group_id, folder_id=folder_id)
+            async with semaphore:
+                if folder_id == "/":
+                    res = await bot.api.call_action("get_group_root_files", group_id=group_id)
+                else:
+                    res = await bot.api.call_action("get_group_files_by_folder", group_id=group_id, folder_id=folder_id)
             
             if not res:
                 return []
@@ -573,14 +1306,15 @@ class OpenlistPlugin(Star):
                 f["relative_path"] = f"{current_path}/{f['file_name']}".lstrip("/")
                 all_files.append(f)
                 
-            for folder in folders:
-                sub_folder_id = folder.get("folder_id")
-                sub_folder_name = folder.get("folder_name")
-                if sub_folder_id:
-                    sub_files = await self._get_group_files_recursive(
-                        bot, group_id, sub_folder_id, f"{current_path}/{sub_folder_name}"
-                    )
-                    all_files.extend(sub_files)
+            # 子文件夹各自捕获异常并返回已获取的部分，结果按原顺序合并
+            sub_results = await asyncio.gather(*(
+                self._get_group_files_recursive(
+                    bot, group_id, folder["folder_id"], f"{current_path}/{folder.get('folder_name')}", semaphore
+                )
+                for folder in folders if folder.get("folder_id")
+            ))
+            for sub_files in sub_results:
+                all_files.extend(sub_files)
                     
             return all_files
         except Exception as e:
@@ -608,20 +1342,15 @@ class OpenlistPlugin(Star):
         max_size_mb = user_config.get("backup_max_size", 0)
         max_size = max_size_mb * 1024 * 1024 if max_size_mb > 0 else 0
         
-        filtered_items = []
-        for item in all_items:
-            name = item.get("file_name", "").lower()
-            size = item.get("file_size", 0)
-            
-            if allowed_exts:
-                ext = os.path.splitext(name)[1]
-                if ext not in allowed_exts:
-                    continue
-            
-            if max_size > 0 and size > max_size:
-                continue
-                
-            filtered_items.append(item)
+        # 未配置任何过滤条件时直接使用全部文件
+        if not allowed_exts and not max_size:
+            filtered_items = all_items
+        else:
+            filtered_items = [
+                item for item in all_items
+                if (not allowed_exts or _file_ext(item.get("file_name", "")) in allowed_exts)
+                and (not max_size or item.get("file_size", 0) <= max_size)
+            ]
             
         if not filtered_items:
             if not is_auto:
@@ -637,71 +1366,105 @@ class OpenlistPlugin(Star):
         success_count = 0
         fail_count = 0
         
-        temp_dir = os.path.join(StarTools.get_data_dir("openlist"), "temp_backup")
-        os.makedirs(temp_dir, exist_ok=True)
-        
-        async with OpenlistClient(
-            user_config["openlist_url"], 
-            user_config.get("public_openlist_url", ""), 
-            user_config.get("username", ""), 
-            user_config.get("password", ""), 
-            user_config.get("token", ""), 
-            user_config.get("fixed_base_directory", "")
-        ) as client:
-            semaphore = asyncio.Semaphore(3)
+        async with self._openlist_client(user_config) as client:
+            semaphore = asyncio.BoundedSemaphore(_BACKUP_CONCURRENCY)
+            url_semaphore = asyncio.BoundedSemaphore(_BACKUP_URL_CONCURRENCY)
+            done_count = 0
+            # 临时文件名前缀：时间戳每次任务取一次，序号保证同一任务内不重复
+            temp_ts = int(time.time())
+            temp_seq = itertools.count()
+
+            async def resolve_url(item):
+                async with url_semaphore:
+                    url_res = await bot.api.call_action("get_group_file_url", group_id=group_id, file_id=item.get("file_id"), busid=item.get("busid", 0))
+                return url_res.get("url")
             
-            async def upload_task(item, idx):
+            async def backup_one(item, url_future):
                 nonlocal success_count, fail_count
-                async with semaphore:
-                    file_id = item.get("file_id")
-                    file_name = item.get("file_name")
-                    rel_path = item.get("relative_path")
-                    file_dir = os.path.dirname(rel_path)
-                    target_dir = f"{target_path.rstrip('/')}/{file_dir}".rstrip("/")
-                    
-                    try:
-                        if file_dir:
-                            parts = file_dir.split("/")
-                            curr = target_path.rstrip("/")
-                            for p in parts:
-                                curr = f"{curr}/{p}"
-                                await client.mkdir(curr)
-                        else:
-                            await client.mkdir(target_path)
-                            
-                        url_res = await bot.api.call_action("get_group_file_url", group_id=group_id, file_id=file_id, busid=item.get("busid", 0))
-                        download_url = url_res.get("url")
-                        if not download_url:
+                file_id = item.get("file_id")
+                file_name = item.get("file_name")
+                target_dir = item["target_dir"]
+                
+                try:
+                    download_url = await url_future
+                    if not download_url:
+                        fail_count += 1
+                        return
+                        
+                    session = await self._get_http_session()
+                    async with session.get(download_url) as resp:
+                        if resp.status != 200:
                             fail_count += 1
                             return
-                            
-                        local_path = os.path.join(temp_dir, f"{int(time.time())}_{file_id}_{file_name}")
-                        try:
-                            async with aiohttp.ClientSession() as session:
-                                async with session.get(download_url) as resp:
-                                    if resp.status == 200:
-                                        with open(local_path, "wb") as f:
-                                            f.write(await resp.read())
-                                        
-                                        up_res = await client.upload_file(local_path, target_dir, file_name)
-                                        if up_res:
-                                            success_count += 1
-                                        else:
-                                            fail_count += 1
-                                    else:
-                                        fail_count += 1
-                        finally:
-                            if os.path.exists(local_path):
-                                os.remove(local_path)
-                    except Exception as e:
-                        logger.error(f"备份文件 {file_name} 失败: {e}")
+                        # 优先采用未压缩响应的 Content-Length，缺失时才用群文件信息中的大小；
+                        # 两者不一致时无法确定实际长度，改为先落盘再上传
+                        resp_size = resp.content_length if not resp.headers.get("Content-Encoding") else None
+                        meta_size = item.get("file_size") or None
+                        if resp_size is not None and meta_size is not None and resp_size != meta_size:
+                            logger.warning(f"备份文件 {file_name} 的响应长度 {resp_size} 与群文件大小 {meta_size} 不一致，改用临时文件上传")
+                            size = None
+                        else:
+                            size = resp_size if resp_size is not None else meta_size
+                        if size is not None:
+                            # 下载流直接转发给上传，不经过内存缓冲和临时文件
+                            up_res = await client.upload_stream(
+                                resp.content.iter_chunked(_DOWNLOAD_CHUNK_SIZE), size, target_dir, file_name
+                            )
+                        else:
+                            local_path = os.path.join(self._backup_temp_dir, f"{temp_ts}_{next(temp_seq)}_{file_id}_{file_name}")
+                            try:
+                                # 临时目录可能在运行中被清理，写入前确保存在
+                                await asyncio.to_thread(os.makedirs, self._backup_temp_dir, exist_ok=True)
+                                await _stream_to_file(resp, local_path)
+                                up_res = await client.upload_file(local_path, target_dir, file_name)
+                            finally:
+                                await asyncio.to_thread(_remove_if_exists, local_path)
+                    if up_res:
+                        success_count += 1
+                    else:
                         fail_count += 1
-            
-            batch_size = 5
-            for i in range(0, total, batch_size):
-                batch_tasks = [upload_task(item, j) for j, item in enumerate(filtered_items[i:i+batch_size], start=i)]
-                await asyncio.gather(*batch_tasks)
-                logger.info(f"⏳ 备份进度: {min(i+batch_size, total)}/{total} (成功: {success_count}, 失败: {fail_count})")
+                except Exception as e:
+                    logger.error(f"备份文件 {file_name} 失败: {e}")
+                    fail_count += 1
+
+            async def upload_task(item, url_future):
+                nonlocal done_count
+                # 先等待下载链接就绪再占用上传并发名额，链接获取不阻塞正在进行的传输
+                await asyncio.wait((url_future,))
+                async with semaphore:
+                    await backup_one(item, url_future)
+                done_count += 1
+                if done_count % 5 == 0 or done_count == total:
+                    logger.info(f"⏳ 备份进度: {done_count}/{total} (成功: {success_count}, 失败: {fail_count})")
+
+            async def mkdir_limited(path):
+                async with semaphore:
+                    await client.mkdir(path)
+
+            # 预先计算每个文件的目标目录，并汇总全部需要的目录（含各级父目录），
+            # 按层级并发创建，每个目录只请求一次
+            base = target_path.rstrip("/")
+            dirs_by_depth = {0: {target_path}}
+            for item in filtered_items:
+                file_dir = os.path.dirname(item.get("relative_path"))
+                curr = base
+                if file_dir:
+                    for depth, part in enumerate(file_dir.split("/"), start=1):
+                        curr = f"{curr}/{part}"
+                        dirs_by_depth.setdefault(depth, set()).add(curr)
+                item["target_dir"] = curr
+
+            # 下载链接的获取独立限流，与创建目录和后续上传重叠进行
+            url_futures = [asyncio.ensure_future(resolve_url(item)) for item in filtered_items]
+            try:
+                for depth in sorted(dirs_by_depth):
+                    await asyncio.gather(*(mkdir_limited(d) for d in dirs_by_depth[depth]))
+
+                # 所有文件一次性提交，由信号量限制并发，不再按批等待最慢的任务
+                await asyncio.gather(*(upload_task(item, fut) for item, fut in zip(filtered_items, url_futures)))
+            finally:
+                for fut in url_futures:
+                    fut.cancel()
                 
         if not is_auto:
             yield event.plain_result(f"✅ 备份任务结束!\n📊 统计: 总计 {total}, 成功 {success_count}, 失败 {fail_count}\n📂 目标: {target_path}")
@@ -715,42 +1478,55 @@ class OpenlistPlugin(Star):
         target_path = upload_state["target_path"]
         try:
             image_path = await image_component.convert_to_file_path()
-            if not image_path or not os.path.exists(image_path):
+            # 一次 stat 同时完成存在性检查和取大小
+            try:
+                file_size = (await asyncio.to_thread(os.stat, image_path)).st_size if image_path else None
+            except FileNotFoundError:
+                file_size = None
+            if file_size is None:
                 yield event.plain_result("❌ 无法获取图片文件，请重新发送")
                 return
 
             try:
-                import time
-                timestamp = int(time.time())
-                if image_path.lower().endswith((".png", ".jpg", ".jpeg", ".gif", ".webp", ".bmp")):
-                    ext = os.path.splitext(image_path)[1]
-                else:
-                    ext = ".jpg"
-                filename = f"image_{timestamp}{ext}"
-                file_size = os.path.getsize(image_path)
                 max_upload_size_mb = user_config.get("max_upload_size", 100)
                 max_upload_size = max_upload_size_mb * 1024 * 1024
                 if file_size > max_upload_size:
                     size_mb = file_size / (1024 * 1024)
                     yield event.plain_result(f"❌ 图片过大: {size_mb:.1f}MB > {max_upload_size_mb}MB")
                     return
+                timestamp = int(time.time())
+                if image_path.lower().endswith(_IMG_EXT):
+                    ext = os.path.splitext(image_path)[1]
+                else:
+                    ext = ".jpg"
+                filename = f"image_{timestamp}{ext}"
                 yield event.plain_result(f"📤 开始上传图片: {filename}\n💾 大小: {self._format_file_size(file_size)}\n📂 目标: {target_path}")
-                async with OpenlistClient(user_config["openlist_url"], user_config.get("public_openlist_url", ""), user_config.get("username", ""), user_config.get("password", ""), user_config.get("token", ""), user_config.get("fixed_base_directory", "")) as client:
+                async with self._openlist_client(user_config) as client:
                     success = await client.upload_file(image_path, target_path, filename)
                     if success:
-                        yield event.plain_result(f"✅ 图片上传成功!\n📄 文件: {filename}\n📂 路径: {target_path}")
-                        self._set_user_upload_waiting(user_id, False)
-                        result = await client.list_files(target_path)
-                        if result:
-                            files = result.get("content", [])
-                            self._update_user_navigation_state(user_id, target_path, files)
+                        # 优先在已知列表中补入新文件；没有可用列表时才刷新，并与成功提示同时进行
+                        files = await self._listing_after_upload(user_config, user_id, target_path, filename, file_size)
+                        list_task = None if files is not None else asyncio.ensure_future(
+                            self._list_dir(client, user_config, target_path, refresh=True)
+                        )
+                        try:
+                            yield event.plain_result(f"✅ 图片上传成功!\n📄 文件: {filename}\n📂 路径: {target_path}")
+                            self._set_user_upload_waiting(user_id, False)
+                            if list_task is not None:
+                                result = await list_task
+                                files = (result.get("content") or []) if result else None
+                        finally:
+                            # 提前结束时取消尚未完成的刷新，避免遗留任务
+                            if list_task is not None:
+                                list_task.cancel()
+                        if files is not None:
+                            self._update_user_navigation_state(user_id, target_path, files, user_config)
                             formatted_list = self._format_file_list(files, target_path, user_config, user_id)
                             yield event.plain_result(f"📁 当前目录已更新:\n\n{formatted_list}")
                     else:
                         yield event.plain_result(f"❌ 上传失败，请检查网络连接和权限\n💡 提示: 管理员可在后台日志中查看详细错误信息")
             finally:
-                if os.path.exists(image_path):
-                    os.remove(image_path)
+                await asyncio.to_thread(_remove_if_exists, image_path)
         except Exception as e:
             logger.error(f"用户 {user_id} 上传图片失败: {e}", exc_info=True)
             yield event.plain_result(f"❌ 上传失败: {str(e)}\n💡 提示: 管理员可在后台日志中查看详细错误信息")
@@ -767,45 +1543,22 @@ class OpenlistPlugin(Star):
         user_id = event.get_sender_id()
         if action == "show":
             user_config = self.get_user_config(user_id)
-            config_text = f"📋 用户 {event.get_sender_name()} 的配置:\n\n"
-            safe_config = user_config.copy()
-            if safe_config.get("password"): safe_config["password"] = "***"
-            if safe_config.get("token"): safe_config["token"] = "***"
-            for k, v in safe_config.items():
-                if k != "setup_completed": config_text += f"🔹 {k}: {v}\n"
+            parts = [f"📋 用户 {event.get_sender_name()} 的配置:\n\n"]
+            parts.extend(
+                f"🔹 {k}: {'***' if k in _SECRET_CONFIG_KEYS and v else (', '.join(sorted(v)) if k in _EXTENSION_KEYS else v)}\n"
+                for k, v in user_config.items() if k != "setup_completed"
+            )
             global_cfg = self.get_global_config()
             require_auth = global_cfg.get("require_user_auth", True)
             default_url = global_cfg.get("openlist_url", "")
             if require_auth:
-                config_text += f"\n💡 提示: 当前启用了用户独立配置模式"
-                if default_url: config_text += f"\n🌐 默认服务器: {default_url}"
+                parts.append("\n💡 提示: 当前启用了用户独立配置模式")
+                if default_url: parts.append(f"\n🌐 默认服务器: {default_url}")
             else:
-                config_text += f"\n💡 提示: 当前使用全局配置模式"
-            yield event.plain_result(config_text)
+                parts.append("\n💡 提示: 当前使用全局配置模式")
+            yield event.plain_result("".join(parts))
         elif action == "setup":
-            user_manager = self.get_user_config_manager(user_id)
-            user_config = user_manager.load_config()
-            setup_text = """🛠️ Openlist配置向导
-
-请按以下步骤配置:
-
-1️⃣ 设置Openlist服务器地址:
-   /ol config set openlist_url http://your-server:5244
-
-2️⃣ 设置用户名(可选):
-   /ol config set username your_username
-
-3️⃣ 设置密码(可选):
-   /ol config set password your_password
-
-4️⃣ 测试连接:
-   /ol config test
-
-5️⃣ 开始使用:
-   /ol ls /
-
-💡 如果服务器不需要登录，只需要设置openlist_url即可"""
-            yield event.plain_result(setup_text)
+            yield event.plain_result(_SETUP_WIZARD_TEXT)
         elif action == "set":
             if not key:
                 yield event.plain_result("❌ 请指定配置项名称")
@@ -815,59 +1568,41 @@ class OpenlistPlugin(Star):
                 return
             user_manager = self.get_user_config_manager(user_id)
             user_config = user_manager.load_config()
-            valid_keys = [
-                "openlist_url", "username", "password", "token", 
-                "max_display_files", "public_openlist_url", 
-                "fixed_base_directory", "allowed_extensions", "max_preview_size", "text_preview_length",
-                "enable_cache", "cache_duration", "max_download_size", "max_upload_size",
-                "backup_allowed_extensions", "backup_max_size"
-            ]
-            if key not in valid_keys:
-                yield event.plain_result(f"❌ 未知的配置项: {key}。可用配置项: {', '.join(valid_keys)}")
+            if key not in _VALID_CONFIG_KEYS:
+                yield event.plain_result(f"❌ 未知的配置项: {key}。可用配置项: {', '.join(_CONFIG_KEYS)}")
                 return
             
-            if key in ["max_display_files", "cache_duration", "backup_max_size", "max_preview_size", "text_preview_length", "max_download_size", "max_upload_size"]:
+            int_range = _INT_CONFIG_RANGES.get(key)
+            if int_range is not None:
                 try:
                     value = int(value)
-                    if key == "max_display_files" and (value < 1 or value > 100):
-                        yield event.plain_result("❌ max_display_files 必须在1-100之间")
-                        return
-                    if key == "cache_duration" and (value < 1):
-                        yield event.plain_result("❌ cache_duration 必须大于0")
-                        return
-                    if key == "backup_max_size" and (value < 0):
-                        yield event.plain_result("❌ backup_max_size 必须大于等于0")
-                        return
-                    if key == "max_download_size" and (value < 0):
-                        yield event.plain_result("❌ max_download_size 必须大于等于0")
-                        return
-                    if key == "max_upload_size" and (value < 0):
-                        yield event.plain_result("❌ max_upload_size 必须大于等于0")
-                        return
-                    if key == "max_preview_size" and (value < -1):
-                        yield event.plain_result("❌ max_preview_size 必须大于等于 -1 (-1表示禁用, 0表示不限制)")
-                        return
-                    if key == "text_preview_length" and (value < 1):
-                        yield event.plain_result("❌ text_preview_length 必须大于0")
-                        return
                 except ValueError:
                     yield event.plain_result(f"❌ {key} 必须是数字")
                     return
-            elif key in ["enable_cache"]:
-                value = value.lower() in ["true", "1", "yes", "on"]
-            elif key in ["allowed_extensions", "backup_allowed_extensions"]:
+                lo, hi, error_msg = int_range
+                if value < lo or (hi is not None and value > hi):
+                    yield event.plain_result(f"❌ {error_msg}")
+                    return
+            elif key in _BOOL_CONFIG_KEYS:
+                value = value.lower() in _TRUE_VALUES
+            elif key in _EXTENSION_KEYS:
                 # 允许输入逗号分隔的字符串，存为列表
                 if isinstance(value, str):
                     value = [ext.strip().lower() for ext in value.split(",") if ext.strip()]
                     # 确保后缀带点
                     value = [ext if ext.startswith(".") else f".{ext}" for ext in value]
             
+            # 连接凭据变更时记下旧的生效配置，保存后移出按旧凭据登录的客户端
+            previous_config = self.get_user_config(user_id) if key in _CREDENTIAL_CONFIG_KEYS else None
             user_config[key] = value
             if key == "openlist_url" and value:
                 user_config["setup_completed"] = True
             user_manager.save_config(user_config)
+            self._invalidate_user_config(user_id)
+            if previous_config and previous_config.get("openlist_url"):
+                await self._evict_client(previous_config)
             
-            display_value = "***" if key in ["password", "token"] else str(value)
+            display_value = "***" if key in _SECRET_CONFIG_KEYS else str(value)
             yield event.plain_result(f"✅ 已为用户 {event.get_sender_name()} 设置 {key} = {display_value}")
         elif action == "test":
             user_config = self.get_user_config(user_id)
@@ -875,7 +1610,7 @@ class OpenlistPlugin(Star):
                 yield event.plain_result("❌ 请先配置Openlist URL\n💡 使用 /ol config setup 开始配置向导")
                 return
             try:
-                async with OpenlistClient(user_config["openlist_url"], user_config.get("public_openlist_url", ""), user_config.get("username", ""), user_config.get("password", ""), user_config.get("token", ""), user_config.get("fixed_base_directory", "")) as client:
+                async with self._openlist_client(user_config) as client:
                     files = await client.list_files("/")
                     if files is not None:
                         yield event.plain_result("✅ Openlist连接测试成功!")
@@ -885,8 +1620,12 @@ class OpenlistPlugin(Star):
                 logger.error(f"用户 {user_id} 连接测试失败: {e}, 服务器: {user_config.get('openlist_url')}", exc_info=True)
                 yield event.plain_result(f"❌ 连接测试失败: {str(e)}\n💡 提示: 管理员可在后台日志中查看详细错误信息")
         elif action == "clear_cache":
-            self.cache_manager.clear_cache(user_id)
-            yield event.plain_result("✅ 已清理您的文件列表缓存")
+            self._invalidate_user_config(user_id)
+            user_config = self.get_user_config(user_id)
+            # 目录缓存按服务器共享，清理当前所用服务器的缓存
+            if self._validate_config(user_config):
+                await asyncio.to_thread(self.cache_manager.clear_cache, self._cache_scope(user_config))
+            yield event.plain_result("✅ 已清理当前账号的文件列表缓存")
         else:
             yield event.plain_result("❌ 未知的操作，支持: show, set, test, setup, clear_cache")
 
@@ -899,15 +1638,17 @@ class OpenlistPlugin(Star):
             yield event.plain_result("❌ 请先配置Openlist连接信息\n💡 使用 /ol config setup 开始配置向导")
             return
         target_path = path
+        known_dir = False
         if path.isdigit():
             number = int(path)
             item = self._get_item_by_number(user_id, number)
             if item:
                 if item.get("is_dir", False):
+                    known_dir = True
                     nav_state = self._get_user_navigation_state(user_id)
                     current_path = nav_state["current_path"]
                     item_name = item.get("name", "")
-                    target_path = f"{current_path.rstrip('/')}/{item_name}"
+                    target_path = _join_path(current_path, item_name)
                 else:
                     async for result in self._get_and_send_download_link(event, item, user_config):
                         yield result
@@ -916,18 +1657,35 @@ class OpenlistPlugin(Star):
                 yield event.plain_result(f"❌ 序号 {number} 无效，请使用 /ol ls 查看当前目录")
                 return
         try:
-            async with OpenlistClient(user_config["openlist_url"], user_config.get("public_openlist_url", ""), user_config.get("username", ""), user_config.get("password", ""), user_config.get("token", ""), user_config.get("fixed_base_directory", "")) as client:
-                file_info = await client.get_file_info(target_path)
-                if file_info and not file_info.get("is_dir", False):
-                    async for result in self._get_and_send_download_link(event, file_info, user_config, full_path=target_path):
-                        yield result
-                    return
-                list_result = await client.list_files(target_path, per_page=0)
+            # 缓存与凭据绑定时，命中直接显示，无需获取客户端（可能需要登录）
+            early_cache = self._cache_before_login(user_config)
+            list_result = await self._get_cached_dir(user_config, target_path) if early_cache else None
+            if list_result is not None:
+                files = list_result.get("content") or []
+                self._update_user_navigation_state(user_id, target_path, files, user_config)
+                yield event.plain_result(self._format_file_list(files, target_path, user_config, user_id))
+                return
+            # 父目录缓存中已知是文件时直接获取链接，避免按目录列出必然失败
+            entry = None if known_dir or not early_cache else await self._find_cached_entry(user_config, target_path)
+            if entry is not None and not entry.get("is_dir", False):
+                async for result in self._get_and_send_download_link(event, entry, user_config, full_path=target_path):
+                    yield result
+                return
+            async with self._openlist_client(user_config) as client:
+                # 先按目录列出，只有失败时才判断是否为文件，目录场景可省去一次请求；
+                # 路径可能是文件，此时列出失败属预期，仅记录调试日志
+                list_result = await self._list_dir(client, user_config, target_path, refresh=early_cache, quiet=not known_dir)
                 if list_result is not None:
                     files = list_result.get("content") or []
-                    self._update_user_navigation_state(user_id, target_path, files)
+                    self._update_user_navigation_state(user_id, target_path, files, user_config)
                     formatted_list = self._format_file_list(files, target_path, user_config, user_id)
                     yield event.plain_result(formatted_list)
+                    return
+                # 序号指向的已知是目录，列出失败时无需再查询文件信息
+                file_info = None if known_dir else await client.get_file_info(target_path)
+                if file_info and not file_info.get("is_dir", False):
+                    async for result in self._get_and_send_download_link(event, file_info, user_config, full_path=target_path):
+                        yield result
                 else:
                     logger.warning(f"用户 {user_id} 无法访问路径: {target_path}")
                     yield event.plain_result(f"❌ 无法访问路径: {target_path}")
@@ -935,55 +1693,40 @@ class OpenlistPlugin(Star):
             logger.error(f"用户 {user_id} 列出文件失败: {e}, 路径: {target_path}", exc_info=True)
             yield event.plain_result(f"❌ 操作失败: {str(e)}\n💡 提示: 管理员可在后台日志中查看详细错误信息")
 
-    @openlist_group.command("next", alias=["下一页"])
-    async def next_page(self, event: AstrMessageEvent):
-        """下一页"""
+    async def _turn_page(self, event: AstrMessageEvent, step: int):
+        """按步长翻页，越界时提示已到首页/末页"""
         user_id = event.get_sender_id()
         user_config = self.get_user_config(user_id)
         nav_state = self._get_user_navigation_state(user_id)
-        if not nav_state.get("items"):
+        all_items = nav_state.get("items")
+        if not all_items:
             yield event.plain_result("🤔 没有可供翻页的列表，请先使用 /ol ls 查看一个目录。")
             return
         current_page = nav_state.get("current_page", 1)
-        all_items = nav_state.get("items", [])
-        max_files_per_page = user_config.get("max_display_files", 20)
-        total_pages = (len(all_items) + max_files_per_page - 1) // max_files_per_page
+        total_pages = nav_state["total_pages"]
 
-        if current_page < total_pages:
-            nav_state["current_page"] += 1
-        else:
-            yield event.plain_result("➡️ 已经是最后一页了。")
+        new_page = max(1, min(total_pages, current_page + step))
+        if new_page == current_page:
+            yield event.plain_result("➡️ 已经是最后一页了。" if step > 0 else "⬅️ 已经是第一页了。")
             return
+        nav_state["current_page"] = new_page
 
         formatted_list = self._format_file_list(
             all_items, nav_state["current_path"], user_config, user_id
         )
         yield event.plain_result(formatted_list)
 
+    @openlist_group.command("next", alias=["下一页"])
+    async def next_page(self, event: AstrMessageEvent):
+        """下一页"""
+        async for result in self._turn_page(event, 1):
+            yield result
+
     @openlist_group.command("prev", alias=["上一页"])
     async def prev_page(self, event: AstrMessageEvent):
         """上一页"""
-        user_id = event.get_sender_id()
-        user_config = self.get_user_config(user_id)
-        nav_state = self._get_user_navigation_state(user_id)
-        if not nav_state.get("items"):
-            yield event.plain_result("🤔 没有可供翻页的列表，请先使用 /ol ls 查看一个目录。")
-            return
-        current_page = nav_state.get("current_page", 1)
-        all_items = nav_state.get("items", [])
-        max_files_per_page = user_config.get("max_display_files", 20)
-        total_pages = (len(all_items) + max_files_per_page - 1) // max_files_per_page
-
-        if current_page > 1:
-            nav_state["current_page"] -= 1
-        else:
-            yield event.plain_result("⬅️ 已经是第一页了。")
-            return
-
-        formatted_list = self._format_file_list(
-            all_items, nav_state["current_path"], user_config, user_id
-        )
-        yield event.plain_result(formatted_list)
+        async for result in self._turn_page(event, -1):
+            yield result
 
     @openlist_group.command("search", alias=["搜索"])
     async def search_files(self, event: AstrMessageEvent, keyword: str, path: str = "/"):
@@ -996,22 +1739,30 @@ class OpenlistPlugin(Star):
         if not self._validate_config(user_config):
             yield event.plain_result("❌ 请先配置Openlist连接信息\n💡 使用 /ol config setup 开始配置向导")
             return
+        async def run_search():
+            async with self._openlist_client(user_config) as client:
+                return await client.search_files(keyword, path)
+
+        # 先发起连接与搜索，再发送进度提示，两者并行进行
+        search_task = asyncio.ensure_future(run_search())
         try:
             yield event.plain_result(f'🔍 正在搜索 "{keyword}"...')
-            async with OpenlistClient(user_config["openlist_url"], user_config.get("public_openlist_url", ""), user_config.get("username", ""), user_config.get("password", ""), user_config.get("token", ""), user_config.get("fixed_base_directory", "")) as client:
-                files = await client.search_files(keyword, path)
-                if files:
-                    search_title = f'🔍 搜索 "{keyword}"' 
-                    self._update_user_navigation_state(user_id, search_title, files)
-
-                    # 使用通用的列表格式化函数显示第一页
-                    formatted_list = self._format_file_list(files, search_title, user_config, user_id)
-                    yield event.plain_result(formatted_list)
-                else:
-                    yield event.plain_result(f"🔍 未找到包含 '{keyword}' 的文件")
+            files = await search_task
+            if files:
+                search_title = f'🔍 搜索 "{keyword}"' 
+                self._update_user_navigation_state(user_id, search_title, files, user_config)
+
+                # 使用通用的列表格式化函数显示第一页
+                formatted_list = self._format_file_list(files, search_title, user_config, user_id)
+                yield event.plain_result(formatted_list)
+            else:
+                yield event.plain_result(f"🔍 未找到包含 '{keyword}' 的文件")
         except Exception as e:
             logger.error(f"用户 {user_id} 搜索文件失败: {e}, 关键词: {keyword}, 路径: {path}", exc_info=True)
             yield event.plain_result(f"❌ 搜索失败: {str(e)}\n💡 提示: 管理员可在后台日志中查看详细错误信息")
+        finally:
+            if not search_task.done():
+                search_task.cancel()
 
     @openlist_group.command("info", alias=["信息"])
     async def file_info(self, event: AstrMessageEvent, path: str):
@@ -1025,7 +1776,7 @@ class OpenlistPlugin(Star):
             yield event.plain_result("❌ 请先配置Openlist连接信息\n💡 使用 /ol config setup 开始配置向导")
             return
         try:
-            async with OpenlistClient(user_config["openlist_url"], user_config.get("public_openlist_url", ""), user_config.get("username", ""), user_config.get("password", ""), user_config.get("token", ""), user_config.get("fixed_base_directory", "")) as client:
+            async with self._openlist_client(user_config) as client:
                 file_info = await client.get_file_info(path)
                 if file_info:
                     name = file_info.get("name", "")
@@ -1033,17 +1784,19 @@ class OpenlistPlugin(Star):
                     modified = file_info.get("modified", "")
                     is_dir = file_info.get("is_dir", False)
                     provider = file_info.get("provider", "")
-                    info_text = f"📋 文件信息\n\n"
-                    info_text += f"📄 名称: {name}\n"
-                    info_text += f"📁 类型: {'目录' if is_dir else '文件'}\n"
-                    info_text += f"📍 路径: {path}\n"
-                    if not is_dir: info_text += f"💾 大小: {self._format_file_size(size)}\n"
-                    if modified: info_text += f"📅 修改时间: {modified.replace('T', ' ').split('.')[0]}\n"
-                    if provider: info_text += f"🔗 存储: {provider}\n"
+                    parts = [
+                        "📋 文件信息\n\n",
+                        f"📄 名称: {name}\n",
+                        f"📁 类型: {'目录' if is_dir else '文件'}\n",
+                        f"📍 路径: {path}\n",
+                    ]
+                    if not is_dir: parts.append(f"💾 大小: {self._format_file_size(size)}\n")
+                    if modified: parts.append(f"📅 修改时间: {modified.replace('T', ' ').split('.')[0]}\n")
+                    if provider: parts.append(f"🔗 存储: {provider}\n")
                     if not is_dir:
-                        download_url = await client.get_download_url(path)
-                        if download_url: info_text += f"\n🔗 下载链接:\n{download_url}"
-                    yield event.plain_result(info_text)
+                        download_url = client.build_download_url(path, file_info)
+                        if download_url: parts.append(f"\n🔗 下载链接:\n{download_url}")
+                    yield event.plain_result("".join(parts))
                 else:
                     logger.warning(f"用户 {user_id} 文件不存在: {path}")
                     yield event.plain_result(f"❌ 文件不存在: {path}")
@@ -1079,7 +1832,7 @@ class OpenlistPlugin(Star):
                 return
         else:
             try:
-                async with OpenlistClient(user_config["openlist_url"], user_config.get("public_openlist_url", ""), user_config.get("username", ""), user_config.get("password", ""), user_config.get("token", ""), user_config.get("fixed_base_directory", "")) as client:
+                async with self._openlist_client(user_config) as client:
                     file_info = await client.get_file_info(path)
                     if file_info and not file_info.get("is_dir", False):
                         item_to_download = file_info
@@ -1111,17 +1864,20 @@ class OpenlistPlugin(Star):
             return
         previous_path = nav_state["parent_paths"].pop()
         try:
-            async with OpenlistClient(user_config["openlist_url"], user_config.get("public_openlist_url", ""), user_config.get("username", ""), user_config.get("password", ""), user_config.get("token", ""), user_config.get("fixed_base_directory", "")) as client:
-                result = await client.list_files(previous_path)
-                if result is not None:
-                    files = result.get("content") or []
-                    nav_state["current_path"] = previous_path
-                    nav_state["items"] = files
-                    formatted_list = self._format_file_list(files, previous_path, user_config, user_id)
-                    yield event.plain_result(f"⬅️ 已返回上级目录\n\n{formatted_list}")
-                else:
-                    logger.warning(f"用户 {user_id} 无法访问上级目录: {previous_path}")
-                    yield event.plain_result(f"❌ 无法访问上级目录: {previous_path}")
+            early_cache = self._cache_before_login(user_config)
+            result = await self._get_cached_dir(user_config, previous_path) if early_cache else None
+            if result is None:
+                async with self._openlist_client(user_config) as client:
+                    result = await self._list_dir(client, user_config, previous_path, refresh=early_cache)
+            if result is not None:
+                files = result.get("content") or []
+                self._set_current_path(nav_state, previous_path)
+                self._set_nav_items(nav_state, files, user_config)
+                formatted_list = self._format_file_list(files, previous_path, user_config, user_id)
+                yield event.plain_result(f"⬅️ 已返回上级目录\n\n{formatted_list}")
+            else:
+                logger.warning(f"用户 {user_id} 无法访问上级目录: {previous_path}")
+                yield event.plain_result(f"❌ 无法访问上级目录: {previous_path}")
         except Exception as e:
             logger.error(f"用户 {user_id} 回退目录失败: {e}, 目标路径: {previous_path}", exc_info=True)
             yield event.plain_result(f"❌ 回退失败: {str(e)}\n💡 提示: 管理员可在后台日志中查看详细错误信息")
@@ -1131,8 +1887,7 @@ class OpenlistPlugin(Star):
         """上传文件命令"""
         user_id = event.get_sender_id()
         if action == "cancel":
-            upload_state = self._get_user_upload_state(user_id)
-            if upload_state["waiting"]:
+            if user_id in self._waiting_users and not self._upload_wait_expired(user_id, time.monotonic()):
                 self._set_user_upload_waiting(user_id, False)
                 yield event.plain_result("✅ 已取消上传模式")
             else:
@@ -1145,26 +1900,7 @@ class OpenlistPlugin(Star):
             nav_state = self._get_user_navigation_state(user_id)
             current_path = nav_state["current_path"]
             self._set_user_upload_waiting(user_id, True, current_path)
-            upload_text = f"""📤 上传模式已启动
-
-📂 目标目录: {current_path}
-
-💡 请直接发送文件或图片，系统会自动上传到此目录
-⏰ 上传模式将在10分钟后自动取消
-
-📋 支持的操作:
-• 直接发送文件 - 上传文件
-• 直接发送图片 - 上传图片
-• /ol upload cancel - 取消上传模式
-• /ol ls - 查看当前目录"""
-            yield event.plain_result(upload_text)
-            async def auto_cancel_upload():
-                await asyncio.sleep(600)
-                upload_state = self._get_user_upload_state(user_id)
-                if upload_state["waiting"]:
-                    self._set_user_upload_waiting(user_id, False)
-                    logger.info(f"用户 {user_id} 上传模式已自动取消（超时10分钟）")
-            asyncio.create_task(auto_cancel_upload())
+            yield event.plain_result(_UPLOAD_PROMPT_TEMPLATE.format(path=current_path))
         else:
             yield event.plain_result("❌ 未知操作，支持: /ol upload 或 /ol upload cancel")
 
@@ -1174,9 +1910,12 @@ class OpenlistPlugin(Star):
         if not isinstance(event, AstrMessageEvent): return
         
         user_id = event.get_sender_id()
+        # 绝大多数消息来自非上传状态的用户，用集合快速过滤
+        if user_id not in self._waiting_users: return
+        # 后台扫描有间隔，这里再按截止时间精确判断一次
+        if self._upload_wait_expired(user_id, time.monotonic()): return
         upload_state = self._get_user_upload_state(user_id)
-        if not upload_state["waiting"]: return
-        
+
         user_config = self.get_user_config(user_id)
         if not self._validate_config(user_config):
             yield event.plain_result("❌ 请先配置Openlist连接信息")
@@ -1185,12 +1924,11 @@ class OpenlistPlugin(Star):
 
         target_path = upload_state["target_path"]
         messages = event.get_messages()
-        file_components = [msg for msg in messages if isinstance(msg, (File, Image))]
+        file_component = next((msg for msg in messages if isinstance(msg, (File, Image))), None)
 
-        if not file_components:
+        if file_component is None:
             yield event.plain_result("❌ 未检测到文件或图片，请发送文件进行上传")
             return
-        file_component = file_components[0]
         if isinstance(file_component, Image):
             async for result in self._upload_image(event, file_component, user_config):
                 yield result
@@ -1206,23 +1944,19 @@ class OpenlistPlugin(Star):
         if not self._validate_config(user_config):
             yield event.plain_result("❌ 请先配置Openlist连接信息\n💡 使用 /ol config setup 开始配置向导")
             return
-            
-        target_path = "/"
-        target_group_id = 0
         
         # 1. 智能解析参数
-        for arg in [arg1, arg2]:
-            if not arg: continue
-            if arg.startswith("/"):
-                target_path = arg
-            elif arg.startswith("@"):
-                try:
-                    target_group_id = int(arg[1:])
-                except ValueError:
-                    yield event.plain_result(f"❌ 无效的群号格式: {arg}")
-                    return
-            else:
-                yield event.plain_result(f"⚠️ 无法识别参数 '{arg}'。路径请以 / 开头，群号请以 @ 开头。")
+        parsed, bad_arg = _parse_target_args(arg1, arg2)
+        if bad_arg is not None:
+            yield event.plain_result(f"⚠️ 无法识别参数 '{bad_arg}'。路径请以 / 开头，群号请以 @ 开头。")
+            return
+        target_path = parsed.get("path", "/")
+        target_group_id = 0
+        if "group" in parsed:
+            try:
+                target_group_id = int(parsed["group"])
+            except ValueError:
+                yield event.plain_result(f"❌ 无效的群号格式: @{parsed['group']}")
                 return
         
         # 2. 确定群号 (手动指定优先，否则用当前群)
@@ -1244,19 +1978,13 @@ class OpenlistPlugin(Star):
             yield event.plain_result("❌ 权限不足。")
             return
         
-        target_gid = None
-        target_path = None
-        
         # 1. 智能解析参数: 路径必须以 / 开头，群号必须以 @ 开头
-        for arg in [arg1, arg2]:
-            if not arg: continue
-            if arg.startswith("/"):
-                target_path = arg
-            elif arg.startswith("@"):
-                target_gid = arg[1:]
-            else:
-                yield event.plain_result(f"⚠️ 无法识别参数 '{arg}'。路径请以 / 开头，群号请以 @ 开头。")
-                return
+        parsed, bad_arg = _parse_target_args(arg1, arg2)
+        if bad_arg is not None:
+            yield event.plain_result(f"⚠️ 无法识别参数 '{bad_arg}'。路径请以 / 开头，群号请以 @ 开头。")
+            return
+        target_path = parsed.get("path")
+        target_gid = parsed.get("group")
         
         # 2. 确定群号 (手动指定优先，否则用当前群)
         if not target_gid:
@@ -1267,27 +1995,30 @@ class OpenlistPlugin(Star):
                 return
 
         local_cfg = self.global_config_manager.load_config()
-        groups = local_cfg.get("autobackup_groups", [])
+        # 按群号索引现有条目（同一群号保留第一条，与生效规则一致），增删均为字典操作
+        entries = {}
+        for item in local_cfg.get("autobackup_groups", []):
+            entries.setdefault(item.partition(":")[0], item)
         
         if action == "enable":
             # enable 必须有路径，没有则用默认
             if not target_path:
                 target_path = f"/backup/group_{target_gid}"
                 
-            new_entry = f"{target_gid}:{target_path}"
-            # 过滤掉旧的该群配置
-            new_groups = [item for item in groups if (item.split(":", 1)[0] if ":" in item else item) != target_gid]
-            new_groups.append(new_entry)
-            local_cfg["autobackup_groups"] = new_groups
+            # 替换旧的该群配置，新条目放在末尾
+            entries.pop(target_gid, None)
+            entries[target_gid] = f"{target_gid}:{target_path}"
+            local_cfg["autobackup_groups"] = list(entries.values())
             self.global_config_manager.save_config(local_cfg)
+            self._invalidate_user_config()
             yield event.plain_result(f"✅ 群 {target_gid} 自动备份已开启 -> {target_path}")
             
         elif action == "disable":
             # disable 只需要群号，忽略路径
-            new_groups = [item for item in groups if (item.split(":", 1)[0] if ":" in item else item) != target_gid]
-            if len(new_groups) < len(groups):
-                local_cfg["autobackup_groups"] = new_groups
+            if entries.pop(target_gid, None) is not None:
+                local_cfg["autobackup_groups"] = list(entries.values())
                 self.global_config_manager.save_config(local_cfg)
+                self._invalidate_user_config()
                 yield event.plain_result(f"✅ 群 {target_gid} 自动备份已禁用。")
             else:
                 yield event.plain_result(f"💡 群 {target_gid} 当前未开启自动备份。")
@@ -1327,24 +2058,33 @@ class OpenlistPlugin(Star):
         yield event.plain_result(f"🚀 正在启动恢复任务...\n📂 来源路径: {path}\n🎯 目标: {target_desc}")
         
         try:
-            async with OpenlistClient(user_config["openlist_url"], user_config.get("public_openlist_url", ""), user_config.get("username", ""), user_config.get("password", ""), user_config.get("token", ""), user_config.get("fixed_base_directory", "")) as client:
-                # 递归搜集文件
+            async with self._openlist_client(user_config) as client:
+                # 递归搜集文件，同级子目录并发列出（由信号量限制总并发数）
                 files_to_restore = []
                 base_path = path.rstrip('/')
+                list_semaphore = asyncio.Semaphore(_RESTORE_LIST_CONCURRENCY)
                 
-                async def collect(current_path):
-                    res = await client.list_files(current_path, per_page=0)
-                    if not res: return
-                    for item in res.get("content", []):
-                        full_item_path = f"{current_path.rstrip('/')}/{item['name']}"
+                async def collect(current_path) -> List[Dict]:
+                    async with list_semaphore:
+                        res = await client.list_files(current_path, per_page=0)
+                    if not res: return []
+                    collected = []
+                    subdirs = []
+                    for item in res.get("content") or []:
+                        full_item_path = _join_path(current_path, item["name"])
                         if item.get("is_dir"):
-                            await collect(full_item_path)
+                            subdirs.append(full_item_path)
                         else:
                             item["full_path"] = full_item_path
                             # 计算相对于基础路径的相对路径
                             rel = full_item_path[len(base_path):].lstrip('/')
                             item["relative_path"] = rel
-                            files_to_restore.append(item)
+                            # 恢复到群时使用的一级文件夹名（位于根目录时为 None）
+                            item["first_folder"] = rel.split("/", 1)[0] if "/" in rel else None
+                            collected.append(item)
+                    for sub_items in await asyncio.gather(*(collect(d) for d in subdirs)):
+                        collected.extend(sub_items)
+                    return collected
                 
                 # 检查路径是否存在及类型
                 file_info = await client.get_file_info(path)
@@ -1353,10 +2093,11 @@ class OpenlistPlugin(Star):
                     return
                 
                 if file_info.get("is_dir"):
-                    await collect(base_path)
+                    files_to_restore.extend(await collect(base_path))
                 else:
                     file_info["full_path"] = path
                     file_info["relative_path"] = file_info["name"]
+                    file_info["first_folder"] = None
                     files_to_restore.append(file_info)
                 
                 if not files_to_restore:
@@ -1372,114 +2113,110 @@ class OpenlistPlugin(Star):
                 if is_group:
                     try:
                         root_files = await event.bot.api.call_action("get_group_root_files", group_id=target_group_id)
-                        if root_files and "folders" in root_files:
-                            for f in root_files["folders"]:
-                                created_folders[f["folder_name"]] = f["folder_id"]
+                        created_folders.update(_group_folder_ids(root_files))
                     except Exception as e:
                         logger.warning(f"获取群根目录文件列表失败: {e}")
 
+                    # 预先创建所有缺失的一级文件夹（接口不返回 ID），最后统一刷新一次列表获取 ID
+                    missing_folders = {
+                        item["first_folder"] for item in files_to_restore if item["first_folder"]
+                    } - created_folders.keys()
+                    if missing_folders:
+                        for folder_name in missing_folders:
+                            try:
+                                await event.bot.api.call_action("create_group_file_folder", group_id=target_group_id, folder_name=folder_name)
+                            except Exception as e:
+                                # 可能是文件夹已存在，稍后从列表匹配
+                                logger.debug(f"创建群文件夹 {folder_name} 失败: {e}")
+                        try:
+                            root_files = await event.bot.api.call_action("get_group_root_files", group_id=target_group_id)
+                            created_folders.update(_group_folder_ids(root_files))
+                        except Exception as e:
+                            logger.error(f"无法获取群文件夹 {', '.join(missing_folders)} 的 ID: {e}")
+
                 success_count = 0
                 fail_count = 0
-                
-                downloads_dir = os.path.join(StarTools.get_data_dir("openlist"), "downloads")
-                os.makedirs(downloads_dir, exist_ok=True)
-
-                for i, item in enumerate(files_to_restore, 1):
+                done_count = 0
+                # 下载与上传各用独立的并发名额，形成流水线：上传慢时下载可继续进行，
+                # 同时进行中（下载中或已下载待发送）的文件总数有上限，避免临时文件堆积
+                pending_semaphore = asyncio.BoundedSemaphore(_RESTORE_CONCURRENCY * 2)
+                download_semaphore = asyncio.BoundedSemaphore(_RESTORE_CONCURRENCY)
+                upload_semaphore = asyncio.BoundedSemaphore(_RESTORE_UPLOAD_CONCURRENCY)
+                # 私聊发送保持串行，以免触发频率限制
+                send_lock = asyncio.Lock()
+                # 临时文件名：时间戳取一次，序号保证并发下载时不重名
+                temp_ts = int(time.time())
+                temp_seq = itertools.count()
+
+                async def restore_one(item) -> bool:
                     file_name = item["name"]
                     full_path = item["full_path"]
-                    rel_path = item["relative_path"]
                     
+                    temp_file_path = os.path.join(self._downloads_dir, f"restore_{temp_ts}_{next(temp_seq)}_{file_name}")
                     try:
                         # 1. 下载文件
-                        download_url = await client.get_download_url(full_path)
-                        if not download_url:
-                            logger.warning(f"无法获取下载链接: {full_path}")
-                            fail_count += 1
-                            continue
-                        
-                        temp_file_path = os.path.join(downloads_dir, f"restore_{int(time.time())}_{file_name}")
-                        
-                        async with aiohttp.ClientSession() as session:
+                        async with download_semaphore:
+                            download_url = await client.get_download_url(full_path)
+                            if not download_url:
+                                logger.warning(f"无法获取下载链接: {full_path}")
+                                return False
+                            
+                            session = await self._get_http_session()
                             async with session.get(download_url) as response:
-                                if response.status == 200:
-                                    with open(temp_file_path, "wb") as f:
-                                        async for chunk in response.content.iter_chunked(8192):
-                                            f.write(chunk)
-                                else:
+                                if response.status != 200:
                                     logger.error(f"下载失败 {file_name}: HTTP {response.status}")
-                                    fail_count += 1
-                                    continue
+                                    return False
+                                await _stream_to_file(response, temp_file_path)
                         
                         # 2. 发送/上传文件
                         if is_group:
-                            # 处理文件夹逻辑 (仅限一层)
-                            folder_id = None
-                            if "/" in rel_path:
-                                folder_name = rel_path.split("/")[0]
-                                if folder_name not in created_folders:
-                                    # 创建文件夹
-                                    try:
-                                        # 接口不返回 ID，直接尝试创建
-                                        await event.bot.api.call_action("create_group_file_folder", group_id=target_group_id, folder_name=folder_name)
-                                        
-                                        # 创建后刷新列表以获取 ID
-                                        root_files = await event.bot.api.call_action("get_group_root_files", group_id=target_group_id)
-                                        if root_files and "folders" in root_files:
-                                            for f in root_files["folders"]:
-                                                if f["folder_name"] == folder_name:
-                                                    created_folders[folder_name] = f["folder_id"]
-                                                    break
-                                    except Exception as e:
-                                        # 可能是文件夹已存在，尝试从列表匹配
-                                        try:
-                                            root_files = await event.bot.api.call_action("get_group_root_files", group_id=target_group_id)
-                                            if root_files and "folders" in root_files:
-                                                for f in root_files["folders"]:
-                                                    if f["folder_name"] == folder_name:
-                                                        created_folders[folder_name] = f["folder_id"]
-                                                        break
-                                        except:
-                                            logger.error(f"无法获取群文件夹 {folder_name} 的 ID: {e}")
-                                
-                                folder_id = created_folders.get(folder_name)
-                            
-                            # 上传群文件
+                            folder_id = created_folders.get(item["first_folder"]) if item["first_folder"] else None
                             try:
-                                await event.bot.api.call_action("upload_group_file", 
-                                    group_id=target_group_id, 
-                                    file=os.path.abspath(temp_file_path), 
-                                    name=file_name, 
-                                    folder=folder_id,
-                                    folder_id=folder_id # 兼容不同平台的参数名
-                                )
-                                success_count += 1
+                                async with upload_semaphore:
+                                    await event.bot.api.call_action("upload_group_file", 
+                                        group_id=target_group_id, 
+                                        file=temp_file_path, 
+                                        name=file_name, 
+                                        folder=folder_id,
+                                        folder_id=folder_id # 兼容不同平台的参数名
+                                    )
+                                return True
                             except Exception as e:
                                 logger.error(f"上传群文件 {file_name} 失败: {e}")
-                                fail_count += 1
+                                return False
                         else:
                             # 私聊发送
                             try:
-                                file_comp = File(name=file_name, file=temp_file_path)
-                                await event.send(MessageChain([file_comp]))
-                                success_count += 1
-                                # 私聊发送后稍作停顿，避免触发频率限制
-                                await asyncio.sleep(1)
+                                async with send_lock:
+                                    await event.send(MessageChain([File(name=file_name, file=temp_file_path)]))
+                                    # 私聊发送后稍作停顿，避免触发频率限制
+                                    await asyncio.sleep(1)
+                                return True
                             except Exception as e:
                                 logger.error(f"私聊发送文件 {file_name} 失败: {e}")
-                                fail_count += 1
-                                
+                                return False
+                    finally:
                         # 3. 清理临时文件
-                        if os.path.exists(temp_file_path):
-                            os.remove(temp_file_path)
-                            
-                        if i % 5 == 0 or i == total:
-                            logger.info(f"🔄 恢复进度: {i}/{total} (成功: {success_count}, 失败: {fail_count})")
-                            
-                    except Exception as e:
-                        logger.error(f"处理文件 {file_name} 时发生错误: {e}")
+                        await asyncio.to_thread(_remove_if_exists, temp_file_path)
+
+                async def restore_task(item):
+                    nonlocal success_count, fail_count, done_count
+                    async with pending_semaphore:
+                        try:
+                            ok = await restore_one(item)
+                        except Exception as e:
+                            logger.error(f"处理文件 {item['name']} 时发生错误: {e}")
+                            ok = False
+                    if ok:
+                        success_count += 1
+                    else:
                         fail_count += 1
-                        if 'temp_file_path' in locals() and os.path.exists(temp_file_path):
-                            os.remove(temp_file_path)
+                    done_count += 1
+                    if done_count % 5 == 0 or done_count == total:
+                        logger.info(f"🔄 恢复进度: {done_count}/{total} (成功: {success_count}, 失败: {fail_count})")
+
+                # 所有文件一次性提交，由上面的信号量分别限制下载、上传和在途文件数
+                await asyncio.gather(*(restore_task(item) for item in files_to_restore))
 
                 yield event.plain_result(f"✅ 恢复任务完成!\n📊 统计: 总计 {total}, 成功 {success_count}, 失败 {fail_count}\n🎯 目标: {target_desc}")
                 
@@ -1515,7 +2252,7 @@ class OpenlistPlugin(Star):
                     return
                 nav_state = self._get_user_navigation_state(user_id)
                 current_path = nav_state["current_path"]
-                full_path = f"{current_path.rstrip('/')}/{item['name']}"
+                full_path = _join_path(current_path, item["name"])
             else:
                 yield event.plain_result(f"❌ 序号 {number} 无效")
                 return
@@ -1523,7 +2260,9 @@ class OpenlistPlugin(Star):
             full_path = path_or_num
         
         try:
-            async with OpenlistClient(user_config["openlist_url"], user_config.get("public_openlist_url", ""), user_config.get("username", ""), user_config.get("password", ""), user_config.get("token", ""), user_config.get("fixed_base_directory", "")) as client:
+            async with self._openlist_client(user_config) as client:
+                # 按路径预览时已取得完整文件信息（含签名），可直接拼接下载链接
+                have_file_info = not item
                 if not item:
                     item = await client.get_file_info(full_path)
                     if not item:
@@ -1535,11 +2274,10 @@ class OpenlistPlugin(Star):
 
                 file_name = item.get("name", "")
                 file_size = item.get("size", 0)
-                ext = os.path.splitext(file_name)[1].lower()
+                ext = _file_ext(file_name)
                 
                 # 压缩包预览支持 (使用 API)
-                archive_extensions = [".zip", ".tar", ".gz", ".7z", ".rar", ".bz2", ".xz"]
-                if ext in archive_extensions:
+                if ext in _ARCHIVE_EXT:
                     yield event.plain_result(f"🔍 正在读取压缩包内容: {file_name}...")
                     archive_data = await client.list_archive_contents(full_path)
                     if archive_data and "content" in archive_data:
@@ -1572,66 +2310,51 @@ class OpenlistPlugin(Star):
                         yield event.plain_result(f"❌ 文件过大 ({file_size / (1024*1024):.2f} MB)，超过了最大预览限制 ({max_preview_size_mb} MB)。")
                         return
 
+                # 仅支持文本预览，其他格式无需下载
+                if ext not in _TEXT_PREVIEW_EXT:
+                    yield event.plain_result(f"❓ 该格式 ({ext}) 不在支持的文本预览列表中。")
+                    return
+
                 yield event.plain_result(f"🔍 正在获取预览: {file_name}...")
                 
                 # 获取下载链接
-                download_url = await client.get_download_url(full_path)
+                if have_file_info:
+                    download_url = client.build_download_url(full_path, item)
+                else:
+                    download_url = await client.get_download_url(full_path)
                 if not download_url:
                     yield event.plain_result("❌ 获取下载链接失败")
                     return
 
-                # 下载到临时目录
-                temp_dir = os.path.join(StarTools.get_data_dir("openlist"), "temp_preview")
-                os.makedirs(temp_dir, exist_ok=True)
-                temp_file_path = os.path.join(temp_dir, f"preview_{int(time.time())}_{file_name}")
-                
-                try:
-                    async with aiohttp.ClientSession() as session:
-                        async with session.get(download_url) as resp:
-                            if resp.status == 200:
-                                with open(temp_file_path, "wb") as f:
-                                    f.write(await resp.read())
-                            else:
-                                yield event.plain_result(f"❌ 下载文件失败: HTTP {resp.status}")
-                                return
+                text_length = user_config.get("text_preview_length", 1000)
+                read_limit = text_length * 4 # 多读一点以防编码问题
+                # 只获取预览所需的开头部分：优先用 Range 请求，服务器不支持时读够即停，不下载整个文件也不落盘
+                session = await self._get_http_session()
+                status, content_bytes = await _read_prefix(session, download_url, read_limit, file_size)
+                if status not in (200, 206):
+                    yield event.plain_result(f"❌ 下载文件失败: HTTP {status}")
+                    return
 
-                    # 仅支持文本预览
-                    text_extensions = [".txt", ".md", ".log", ".json", ".xml", ".yaml", ".yml", ".ini", ".conf", ".cfg", ".toml", ".py", ".js", ".java", ".c", ".cpp", ".h", ".go", ".rs", ".php", ".rb", ".sh", ".bash", ".html", ".htm", ".css", ".jsx", ".tsx", ".ts", ".vue", ".sql", ".csv", ".properties", ".env"]
+                try:
+                    # 检测编码（合法 UTF-8 直接识别，其余使用 chardet）
+                    encoding, confidence = _detect_encoding(content_bytes)
+                    logger.debug(f"文本预览编码检测: {encoding}, 置信度: {confidence:.2f}")
                     
-                    if ext in text_extensions:
-                        text_length = user_config.get("text_preview_length", 1000)
-                        try:
-                            with open(temp_file_path, "rb") as f:
-                                content_bytes = f.read(text_length * 4) # 多读一点以防编码问题
-                                
-                                # 使用 chardet 检测编码
-                                detection = chardet.detect(content_bytes)
-                                encoding = detection.get('encoding', 'utf-8') or 'utf-8'
-                                confidence = detection.get('confidence', 0)
-                                logger.debug(f"文本预览编码检测: {encoding}, 置信度: {confidence:.2f}")
-                                
-                                try:
-                                    decoded_text = content_bytes.decode(encoding, errors='ignore').strip()
-                                except:
-                                    # 如果检测出的编码失败，回退到 utf-8
-                                    encoding = 'utf-8'
-                                    decoded_text = content_bytes.decode('utf-8', errors='ignore').strip()
-                                    
-                                preview_text = decoded_text[:text_length]
-                                if len(decoded_text) > text_length:
-                                    preview_text += "\n\n..."
-                                
-                                yield event.plain_result(f"📝 文本预览:\n---\n{preview_text}")
-                        except Exception as e:
-                            logger.error(f"文本预览失败: {e}")
-                            yield event.plain_result(f"❌ 文本解析失败: {e}")
-                    else:
-                        yield event.plain_result(f"❓ 该格式 ({ext}) 不在支持的文本预览列表中。")
-
-                finally:
-                    # 清理临时文件
-                    if os.path.exists(temp_file_path):
-                        os.remove(temp_file_path)
+                    try:
+                        decoded_text = content_bytes.decode(encoding, errors='ignore').strip()
+                    except:
+                        # 如果检测出的编码失败，回退到 utf-8
+                        encoding = 'utf-8'
+                        decoded_text = content_bytes.decode('utf-8', errors='ignore').strip()
+                        
+                    preview_text = decoded_text[:text_length]
+                    if len(decoded_text) > text_length:
+                        preview_text += "\n\n..."
+                    
+                    yield event.plain_result(f"📝 文本预览:\n---\n{preview_text}")
+                except Exception as e:
+                    logger.error(f"文本预览失败: {e}")
+                    yield event.plain_result(f"❌ 文本解析失败: {e}")
 
         except Exception as e:
             logger.error(f"预览失败: {e}", exc_info=True)
@@ -1672,10 +2395,11 @@ class OpenlistPlugin(Star):
             display_name = path
 
         try:
-            async with OpenlistClient(user_config["openlist_url"], user_config.get("public_openlist_url", ""), user_config.get("username", ""), user_config.get("password", ""), user_config.get("token", ""), user_config.get("fixed_base_directory", "")) as client:
+            async with self._openlist_client(user_config) as client:
                 success = await client.remove(target_dir, target_names)
                 if success:
                     yield event.plain_result(f"✅ 已删除: {display_name}")
+                    await self._drop_dir_cache(user_config, target_dir)
                     
                     # 检查是否删除了当前路径或其父目录
                     nav_state = self._get_user_navigation_state(user_id)
@@ -1684,9 +2408,10 @@ class OpenlistPlugin(Star):
                     # 构建被删除项目的完整路径列表
                     deleted_full_paths = []
                     for name in target_names:
-                        p = f"{target_dir.rstrip('/')}/{name}"
+                        p = _join_path(target_dir, name)
                         if not p.startswith("/"): p = "/" + p
                         deleted_full_paths.append(p)
+                        await self._drop_dir_cache(user_config, p)
                     
                     # 如果当前路径被删除（或当前路径是其子目录），返回根目录
                     is_current_path_deleted = False
@@ -1697,22 +2422,17 @@ class OpenlistPlugin(Star):
                     
                     if is_current_path_deleted:
                         # 返回根目录并刷新
-                        result = await client.list_files("/")
+                        result = await self._list_dir(client, user_config, "/")
                         if result is not None:
                             files = result.get("content") or []
-                            self.user_navigation_state[user_id] = {
-                                "current_path": "/",
-                                "items": files,
-                                "parent_paths": [],
-                                "current_page": 1,
-                            }
+                            self._reset_navigation(user_id, "/", files, user_config)
                             yield event.plain_result("⚠️ 当前目录已被删除，已自动返回根目录。")
                     elif target_dir == current_path:
                         # 如果在当前目录下删除了某个项目，刷新当前目录
-                        result = await client.list_files(current_path)
+                        result = await self._list_dir(client, user_config, current_path, refresh=True)
                         if result is not None:
                             files = result.get("content") or []
-                            self._update_user_navigation_state(user_id, current_path, files)
+                            self._update_user_navigation_state(user_id, current_path, files, user_config)
                 else:
                     yield event.plain_result(f"❌ 删除失败，请检查权限或路径是否正确")
         except Exception as e:
@@ -1734,24 +2454,25 @@ class OpenlistPlugin(Star):
         # 如果不是绝对路径，则在当前目录下创建
         if not name.startswith("/"):
             nav_state = self._get_user_navigation_state(user_id)
-            full_path = f"{nav_state['current_path'].rstrip('/')}/{name}"
+            full_path = _join_path(nav_state["current_path"], name)
         else:
             full_path = name
 
         try:
-            async with OpenlistClient(user_config["openlist_url"], user_config.get("public_openlist_url", ""), user_config.get("username", ""), user_config.get("password", ""), user_config.get("token", ""), user_config.get("fixed_base_directory", "")) as client:
+            async with self._openlist_client(user_config) as client:
                 success = await client.mkdir(full_path)
                 if success:
                     yield event.plain_result(f"✅ 已创建文件夹: {name}")
+                    await self._drop_dir_cache(user_config, os.path.dirname(full_path))
                     # 如果在当前目录下创建，刷新列表
                     nav_state = self._get_user_navigation_state(user_id)
                     current_path = nav_state["current_path"]
                     # 检查创建的文件夹是否在当前目录下（直接子目录）
                     if os.path.dirname(full_path) == current_path.rstrip("/") or (current_path == "/" and os.path.dirname(full_path) == "/"):
-                        result = await client.list_files(current_path)
+                        result = await self._list_dir(client, user_config, current_path, refresh=True)
                         if result:
                             files = result.get("content") or []
-                            self._update_user_navigation_state(user_id, current_path, files)
+                            self._update_user_navigation_state(user_id, current_path, files, user_config)
                 else:
                     yield event.plain_result(f"❌ 创建文件夹失败")
         except Exception as e:
@@ -1761,120 +2482,30 @@ class OpenlistPlugin(Star):
     @openlist_group.command("help", alias=["帮助"])
     async def help_command(self, event: AstrMessageEvent):
         """显示帮助信息"""
-        user_id = event.get_sender_id()
-        user_config = self.get_user_config(user_id)
         global_cfg = self.get_global_config()
         is_user_auth_mode = global_cfg.get("require_user_auth", True)
 
-        help_text = f"""📚 OpenList 助手帮助
-💡 您也可以使用别名 `/网盘` 代替 `/ol`。
-
----
-核心导航指令
----
-▶️ `/ol ls [路径|序号]`
-   - 浏览目录: 列出内容，若文件过多会自动分页。
-     - 示例: `/ol ls` 或 `/ol ls /movies`
-   - 进入子目录:
-     - 示例: `/ol ls 1` (如果1是目录)
-   - 获取链接: 获取文件的下载链接。
-     - 示例: `/ol ls 2` (如果2是文件)
-
-▶️ `/ol next` - 下一页
-▶️ `/ol prev` - 上一页
-
-▶️ `/ol quit`
-   - 返回到上级目录。
-
----
-文件操作指令
----
-📥 `/ol download <路径|序号>`
-   - 直接下载: 将文件作为附件发送给您。
-     - 示例: `/ol download 3` (下载列表中的3号文件)
-     - 示例: `/ol download /docs/report.pdf`
-
-🔍 `/ol search <关键词> [路径]`
-   - 搜索文件。注意：搜索依赖服务器索引，可能不是最新的。
-     - 示例: `/ol search "年度报告"`
-
-ℹ️ `/ol info <路径>`
-   - 查看文件或目录的详细信息，不支持序号。
-     - 示例: `/ol info /docs/report.pdf`
-
-👁️ `/ol preview <路径|序号>`
-   - 预览内容: 支持文本文件内容预览或压缩包目录查看。
-     - 示例: `/ol preview 1`
-     - 示例: `/ol preview /data/config.txt`
-
-📂 `/ol mkdir <名称|路径>`
-   - 新建文件夹: 在当前目录或指定路径创建。
-     - 示例: `/ol mkdir new_folder`
-
-🗑️ `/ol rm <路径|序号>`
-   - 删除项目: 删除文件或文件夹（谨慎操作）。
-     - 示例: `/ol rm 4`
-     - 示例: `/ol rm /tmp/old_file.txt`
-
-📤 `/ol upload [cancel]`
-   - `/ol upload`: 在当前目录开启上传模式。
-   - `/ol upload cancel`: 取消上传。
-   - `使用`: 开启后，直接向机器人发送文件或图片即可。
-
-📦 `/ol backup [/目标路径] [@群号]`
-   - 将指定群聊的所有文件递归备份到 Openlist。
-   - 示例: `/ol backup /群备份 @123456`
-   - 提示: 路径须以 `/` 开头，群号须以 `@` 开头。默认备份当前群到根目录。
-
-🔄 `/ol autobackup <enable|disable> [@群号] [/路径]`
-   - 配置群文件自动备份（新上传文件自动同步）。
-   - 示例: `/ol autobackup enable` (开启当前群备份到默认路径)
-   - 示例: `/ol autobackup enable @123456 /backup` (指定群号和路径)
-   - 示例: `/ol autobackup disable @123456` (禁用指定群的自动备份)
-   - 提示: 禁用时无需提供路径。路径须以 `/` 开头，群号须以 `@` 开头。
-
-🚚 `/ol restore <路径> [@群号]`
-   - 将 Openlist 路径中的文件恢复（发送）到目标群组或私聊。
-   - 示例: `/ol restore /backup/group_123456` (恢复到当前会话)
-   - 示例: `/ol restore /docs @987654` (恢复到指定群)
-   - 提示: 目标为群组时会尝试保持一级目录结构。
-
----
-插件配置指令
----
-⚙️ `/ol config setup` - 推荐新用户使用，启动交互式配置向导。
-⚙️ `/ol config show` - 显示您当前的配置。
-⚙️ `/ol config set <键> <值>` - 修改配置项。
-⚙️ `/ol config test` - 测试与服务器的连接。
-⚙️ `/ol config clear_cache` - 清除文件列表缓存。
-"""
-
+        parts = [_HELP_BODY]
         if is_user_auth_mode:
-            help_text += f"""
-
-👤 当前模式: 用户独立认证
-   - 每位用户都需要使用 `/ol config setup` 单独配置自己的 Openlist 账户信息。"""
-
-            if not self._validate_config(user_config):
-                help_text += f"""
-
-⚠️ 操作提示
-   您尚未完成配置，请发送 `/ol config setup` 开始配置向导。"""
+            parts.append(_HELP_AUTH_MODE)
+            # 仅用户认证模式需要判断当前用户是否已配置
+            if not self._validate_config(self.get_user_config(event.get_sender_id())):
+                parts.append(_HELP_NEED_SETUP)
         else:
-            help_text += f"""
-
-🌐 当前模式: 全局共享
-   - 所有用户共享管理员预设的 Openlist 服务器连接，无需单独配置。"""
-
-        help_text += f"""
-
-💡 通用提示:
-1.  路径区分大小写，以 `/` 开头表示根目录。
-2.  `ls` 获取链接，`download` 直接发送文件。
-3.  管理员可在机器人后台的插件配置页面调整全局设置。"""
+            parts.append(_HELP_GLOBAL_MODE)
+        parts.append(_HELP_TAIL)
+        help_text = "".join(parts)
 
         yield event.plain_result(help_text)
 
     async def terminate(self):
         """插件卸载时执行的清理操作"""
+        if self._temp_reaper_task:
+            self._temp_reaper_task.cancel()
+        await self._reap_temp_files(force=True)
+        await self._close_client_pool()
+        if self._http_session and not self._http_session.closed:
+            await self._http_session.close()
+        if self._connector and not self._connector.closed:
+            await self._connector.close()
         logger.info("OpenList助手已卸载")
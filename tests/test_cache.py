@@ -0,0 +1,48 @@
+import tempfile
+import unittest
+from unittest import mock
+
+from test_navigation import _load_plugin_module, astrbot
+
+
+class _Client:
+    def __init__(self, content):
+        self.content = content
+
+    async def list_files(self, path, per_page=0, quiet=False):
+        return {"content": self.content}
+
+
+@unittest.skipIf(astrbot is None, "需要 AstrBot 运行环境")
+class DirCacheScopeTest(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        main = _load_plugin_module()
+        cache_module = __import__("openlistfile.lib.cache", fromlist=["CacheManager"])
+        self.tmp = tempfile.TemporaryDirectory()
+        with mock.patch.object(cache_module.StarTools, "get_data_dir", return_value=self.tmp.name):
+            cache_manager = cache_module.CacheManager("openlistfile")
+        plugin = main.OpenlistPlugin.__new__(main.OpenlistPlugin)
+        plugin.cache_manager = cache_manager
+        self.plugin = plugin
+        base = {"openlist_url": "http://example", "username": "alice", "enable_cache": True}
+        self.owner = dict(base, token="owner-token")
+        self.other = dict(base, token="", password="")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    async def test_users_with_different_credentials_do_not_share_listings(self):
+        secret = [{"name": "secret.txt", "size": 1, "is_dir": False}]
+        await self.plugin._list_dir(_Client(secret), self.owner, "/secret", refresh=True)
+
+        self.assertEqual((await self.plugin._get_cached_dir(self.owner, "/secret"))["content"], secret)
+        self.assertIsNone(await self.plugin._get_cached_dir(self.other, "/secret"))
+        self.assertIsNone(await self.plugin._find_cached_entry(self.other, "/secret/secret.txt"))
+
+        listing = await self.plugin._list_dir(_Client([]), self.other, "/secret")
+        self.assertEqual(listing["content"], [])
+        self.assertEqual((await self.plugin._get_cached_dir(self.owner, "/secret"))["content"], secret)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,91 @@
+import importlib
+import sys
+import types
+import unittest
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from pathlib import Path
+
+try:
+    import astrbot  # noqa: F401
+except ImportError:
+    astrbot = None
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def _load_plugin_module():
+    """以包的形式导入插件（main.py 使用相对导入）"""
+    if "openlistfile" not in sys.modules:
+        pkg = types.ModuleType("openlistfile")
+        pkg.__path__ = [str(ROOT)]
+        sys.modules["openlistfile"] = pkg
+    return importlib.import_module("openlistfile.main")
+
+
+class _Event:
+    def __init__(self, user_id="u1"):
+        self.user_id = user_id
+
+    def get_sender_id(self):
+        return self.user_id
+
+    def plain_result(self, text):
+        return text
+
+
+class _Client:
+    async def remove(self, target_dir, names):
+        return True
+
+
+@unittest.skipIf(astrbot is None, "需要 AstrBot 运行环境")
+class RemoveThenNextPageTest(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        main = _load_plugin_module()
+        plugin = main.OpenlistPlugin.__new__(main.OpenlistPlugin)
+        plugin.user_navigation_state = {}
+        plugin.user_upload_state = {}
+        plugin._user_last_seen = OrderedDict()
+        self.user_config = {"openlist_url": "http://example", "max_display_files": 2}
+        self.root_items = [{"name": f"f{i}", "size": i, "is_dir": False} for i in range(5)]
+
+        @asynccontextmanager
+        async def openlist_client(user_config):
+            yield _Client()
+
+        async def list_dir(client, user_config, path, refresh=False):
+            return {"content": self.root_items}
+
+        async def drop_dir_cache(*args, **kwargs):
+            pass
+
+        plugin.get_user_config = lambda user_id: self.user_config
+        plugin._openlist_client = openlist_client
+        plugin._list_dir = list_dir
+        plugin._drop_dir_cache = drop_dir_cache
+        self.plugin = plugin
+
+    async def _collect(self, agen):
+        return [r async for r in agen]
+
+    async def test_next_page_after_removing_current_directory(self):
+        event = _Event()
+        nav_state = self.plugin._get_user_navigation_state(event.user_id)
+        self.plugin._update_user_navigation_state(event.user_id, "/docs", [{"name": "a", "is_dir": False}], self.user_config)
+        nav_state["parent_paths"].append("/")
+
+        await self._collect(self.plugin.remove_command(event, "/docs"))
+
+        nav_state = self.plugin._get_user_navigation_state(event.user_id)
+        self.assertEqual(nav_state["current_path"], "/")
+        self.assertEqual(len(nav_state["parent_paths"]), 0)
+        self.assertEqual(nav_state["total_pages"], 3)
+
+        results = await self._collect(self.plugin._turn_page(event, 1))
+        self.assertEqual(nav_state["current_page"], 2)
+        self.assertEqual(len(results), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
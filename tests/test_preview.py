@@ -0,0 +1,65 @@
+import unittest
+
+from test_navigation import _load_plugin_module, astrbot
+
+
+class _Content:
+    def __init__(self, data):
+        self.data = data
+
+    async def iter_chunked(self, size):
+        for i in range(0, len(self.data), size):
+            yield self.data[i:i + size]
+
+
+class _Response:
+    def __init__(self, status, data=b""):
+        self.status = status
+        self.content = _Content(data)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+class _Session:
+    """模拟服务器：带 Range 头请求空文件时返回 416"""
+
+    def __init__(self, data):
+        self.data = data
+        self.requests = []
+
+    def get(self, url, headers=None):
+        self.requests.append(headers)
+        if headers and "Range" in headers and not self.data:
+            return _Response(416)
+        return _Response(206 if headers else 200, self.data)
+
+
+@unittest.skipIf(astrbot is None, "需要 AstrBot 运行环境")
+class ReadPrefixTest(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.main = _load_plugin_module()
+
+    async def test_empty_file_is_fetched_without_range(self):
+        session = _Session(b"")
+        status, data = await self.main._read_prefix(session, "http://example/empty.txt", 4000, 0)
+        self.assertEqual((status, data), (200, b""))
+        self.assertEqual(session.requests, [None])
+
+    async def test_range_not_satisfiable_is_treated_as_empty(self):
+        session = _Session(b"")
+        status, data = await self.main._read_prefix(session, "http://example/empty.txt", 4000, 10)
+        self.assertEqual((status, data), (200, b""))
+
+    async def test_prefix_is_truncated_to_limit(self):
+        session = _Session(b"x" * 100)
+        status, data = await self.main._read_prefix(session, "http://example/a.txt", 10, 100)
+        self.assertEqual((status, data), (206, b"x" * 10))
+        self.assertEqual(session.requests, [{"Range": "bytes=0-9"}])
+
+
+if __name__ == "__main__":
+    unittest.main()